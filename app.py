@@ -10,54 +10,177 @@ Features:
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import numpy as np
+import bisect
+import html
+import math
+import re
 from pathlib import Path
-import base64
 
 from src.omnisorter_common import (
     initialize_session_state_safely,
     get_omnisorter_specs,
     get_container_matrix,
     get_container_model_config,
-    get_app_settings
+    get_app_settings,
+    clear_config_cache,
+    SimulationParams
 )
-from src.contact_form import render_contact_form
+from src.scoring_kernel import score_models
+from src.image_utils import get_asset_index, load_image_data_uri
+
+@st.cache_resource(show_spinner=False)
+def _cached_app_settings():
+    """アプリケーション設定をプロセス内で共有する（読み取り専用として扱うこと）"""
+    return get_app_settings()
+
 
 # アプリケーション設定を読み込み
-APP_SETTINGS = get_app_settings()
+APP_SETTINGS = _cached_app_settings()
 
 # 画像ディレクトリのパス
 ASSETS_DIR = Path(__file__).parent / "assets" / "images"
 
 
 def get_model_image_base64(image_filename: str) -> str:
-    """機種画像をBase64エンコードして返す"""
+    """機種画像をBase64データURIで返す（画像が存在しない場合は None）"""
     if not image_filename:
         return None
+    # 事前生成したサイドカー（.b64）があれば再エンコードしない
+    data_uri = get_asset_index(ASSETS_DIR).get(image_filename)
+    if data_uri is None:
+        # インデックスは直下の既知の拡張子のみ。サブディレクトリや未知の拡張子は
+        # 従来どおりパスを直接読み込む（未知の拡張子は image/png 扱い）
+        data_uri = load_image_data_uri(ASSETS_DIR / image_filename)
+    return data_uri
 
-    image_path = ASSETS_DIR / image_filename
-    if not image_path.exists():
-        return None
 
-    with open(image_path, "rb") as f:
-        data = base64.b64encode(f.read()).decode()
-
-    # 拡張子から MIME タイプを判定
-    suffix = image_path.suffix.lower()
-    mime_types = {
-        '.png': 'image/png',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp'
+@st.cache_resource(show_spinner=False)
+def _cached_specs():
+    """機種スペックをプロセス内で共有する（読み取り専用として扱うこと）"""
+    return get_omnisorter_specs()
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_matrix():
+    """容器×機種マトリクスをプロセス内で共有する（読み取り専用として扱うこと）"""
+    return get_container_matrix()
+
+
+@st.cache_resource(show_spinner=False)
+def _build_spec_arrays():
+    """機種スペックを機種ごとの並列配列（SoA）に展開する
+
+    スコアリングで参照するフィールドを一度だけ取り出しておき、
+    計算時は配列演算でまとめて評価する。
+    引数を取らないため、キャッシュヒット時にスペック辞書をハッシュしない。
+    """
+    product_specs = _cached_specs()
+    names = list(product_specs.keys())
+    max_L, max_W, max_H, max_weight = [], [], [], []
+    processing_capacity, total_ports, ports_per_block = [], [], []
+    mini_blocks, min_blocks, max_blocks = [], [], []
+
+    # 1機種につき各フィールドを一度だけ取り出す
+    for spec in product_specs.values():
+        max_product = spec.get('maxProduct') or {}
+        max_L.append(max_product.get('L', 9999))
+        max_W.append(max_product.get('W', 9999))
+        max_H.append(max_product.get('H', 9999))
+        max_weight.append(max_product.get('weight', 9999))
+        processing_capacity.append(spec.get('processingCapacity', 1200))
+        total_ports.append(spec.get('totalPorts', 200))
+        ports_per_block.append(spec.get('portsPerBlock', 40))
+
+        # blocks: mini は固定ブロック数、標準機は {min, max} の上下限
+        blocks_config = spec.get('blocks', 2)
+        if isinstance(blocks_config, dict):
+            mini_blocks.append(2)
+            min_blocks.append(blocks_config.get('min', 1))
+            max_blocks.append(blocks_config.get('max', 10))
+        else:
+            mini_blocks.append(blocks_config)
+            min_blocks.append(1)
+            max_blocks.append(10)
+
+    return {
+        'names': names,
+        'max_L': np.array(max_L, dtype=float),
+        'max_W': np.array(max_W, dtype=float),
+        'max_H': np.array(max_H, dtype=float),
+        'max_weight': np.array(max_weight, dtype=float),
+        'processing_capacity': np.array(processing_capacity, dtype=float),
+        'total_ports': np.array(total_ports, dtype=int),
+        'ports_per_block': np.array(ports_per_block, dtype=int),
+        'is_mini': np.array(['mini' in name.lower() for name in names], dtype=bool),
+        'mini_blocks': np.array(mini_blocks, dtype=int),
+        'min_blocks': np.array(min_blocks, dtype=int),
+        'max_blocks': np.array(max_blocks, dtype=int),
     }
-    mime_type = mime_types.get(suffix, 'image/png')
 
-    return f"data:{mime_type};base64,{data}"
+
+@st.cache_resource(show_spinner=False)
+def _resolve_calc_settings():
+    """計算・スコアリング設定を既定値で補完して一度だけ解決する
+
+    設定ファイルは再起動まで変わらないため、計算のたびに .get を辿らない。
+    """
+    app_settings = _cached_app_settings()
+    calc_settings = app_settings.get('calculation', {})
+    scoring_settings = app_settings.get('scoring', {})
+    model_priority = scoring_settings.get('model_priority', {})
+    util_settings = scoring_settings.get('utilization', {})
+    cost_penalty = scoring_settings.get('cost_penalty', {})
+
+    return {
+        'target_utilization': calc_settings.get('target_utilization', 0.95),
+        'target_rotation': max(1, calc_settings.get('target_rotation', 5)),  # 目標回転数（最小1）
+        'max_units': calc_settings.get('max_units', 2),  # 台数上限（デフォルト2台）
+        'debug': bool(app_settings.get('debug', False)),
+        'model_priority': model_priority,
+        'mini_threshold': scoring_settings.get('mini_threshold_pcs', 3000),
+        'mini_small_priority': model_priority.get('mini_small', 150),
+        'mini_large_priority': model_priority.get('mini_large', 10),
+        'container_recommended_bonus': scoring_settings.get('container_recommended_bonus', 20),
+        # 稼働率適合度・コストペナルティの係数（score_models の scoring 引数）
+        'scoring': (
+            util_settings.get('optimal_min', 60),
+            util_settings.get('optimal_max', 85),
+            util_settings.get('high_max', 95),
+            util_settings.get('optimal_bonus', 15),
+            util_settings.get('high_bonus', 10),
+            util_settings.get('overload_penalty', -10),
+            cost_penalty.get('units_penalty', 30),
+            cost_penalty.get('ports_penalty', 0.1),
+            cost_penalty.get('ports_baseline', 40),
+        ),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _build_base_priority():
+    """機種優先度スコアを機種ごとに事前計算する
+
+    mini は日次処理量（閾値以下/超過）で優先度が変わるため、両方の配列を返す。
+
+    Returns:
+        (小規模運用時の優先度配列, 大規模運用時の優先度配列)
+    """
+    calc_settings = _resolve_calc_settings()
+    model_priority = calc_settings['model_priority']
+    spec_arrays = _build_spec_arrays()
+    is_mini = spec_arrays['is_mini']
+
+    default_priority = {'S': 100, 'M': 50, 'L': 25}
+    named_priority = np.array([
+        model_priority.get(model_name, default_priority[model_name]) if model_name in default_priority else 0
+        for model_name in spec_arrays['names']
+    ], dtype=float)
+
+    return (
+        np.where(is_mini, calc_settings['mini_small_priority'], named_priority),
+        np.where(is_mini, calc_settings['mini_large_priority'], named_priority),
+    )
 
 
 # ページ設定
@@ -95,165 +218,196 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# セッションのデフォルト値
+_APP_DEFAULTS = {
+    'daily_orders': 100,
+    'pieces_per_order': 2.5,
+    'working_hours': 8,
+    'product_length': 300,
+    'product_width': 200,
+    'product_height': 150,
+    'product_weight': 1.5,
+}
+
+
 def initialize_app():
     """アプリケーションの初期化"""
     initialize_session_state_safely()
 
-    # デフォルト値の設定
-    if 'daily_orders' not in st.session_state:
-        st.session_state['daily_orders'] = 100
-    if 'pieces_per_order' not in st.session_state:
-        st.session_state['pieces_per_order'] = 2.5
-    if 'working_hours' not in st.session_state:
-        st.session_state['working_hours'] = 8
-    if 'product_length' not in st.session_state:
-        st.session_state['product_length'] = 300
-    if 'product_width' not in st.session_state:
-        st.session_state['product_width'] = 200
-    if 'product_height' not in st.session_state:
-        st.session_state['product_height'] = 150
-    if 'product_weight' not in st.session_state:
-        st.session_state['product_weight'] = 1.5
+    # デフォルト値の設定（未設定のキーのみ）
+    for key, value in _APP_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
 
 
 def render_input_form():
-    """入力フォームの表示"""
+    """入力フォームの表示
+
+    Returns:
+        (入力パラメータ, 送信ボタンが押されたか) のタプル
+    """
     st.subheader("📋 作業条件の入力")
 
     # 設定からデフォルト値を取得
     ui_defaults = APP_SETTINGS.get('ui_defaults', {})
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("#### 基本情報")
-        company_name = st.text_input(
-            "会社名",
-            placeholder="例：株式会社サンプル",
-            key="input_company_name"
-        )
-        industry = st.selectbox(
-            "業界",
-            ["EC・通販", "小売・卸売", "食品", "アパレル", "医薬品", "製造業", "3PL", "その他"],
-            key="input_industry"
-        )
-        business_type = st.selectbox(
-            "事業形態",
-            ["B2C（toC）", "B2B（toB）", "B2B2C", "その他"],
-            key="input_business_type"
-        )
-
-        st.markdown("#### 運用条件")
-        daily_orders = st.number_input(
-            "平均日次出荷件数",
-            min_value=1,
-            max_value=50000,
-            value=ui_defaults.get('daily_orders', 1000),
-            step=10,
-            key="input_daily_orders",
-            help="1日あたりの出荷件数を入力"
-        )
-
-        pieces_per_order = st.number_input(
-            "平均ピース数/件",
-            min_value=0.1,
-            max_value=1000.0,
-            value=ui_defaults.get('pieces_per_order', 2.0),
-            step=0.1,
-            key="input_pieces_per_order",
-            help="1件あたりの平均商品点数"
-        )
-
-        working_hours = st.number_input(
-            "作業可能時間/日（時間）",
-            min_value=1.0,
-            max_value=24.0,
-            value=ui_defaults.get('working_hours', 8.0),
-            step=1.0,
-            key="input_working_hours",
-            help="1日で仕分けにとれる作業可能時間"
-        )
+    # フォームにまとめ、入力のたびに再実行されないようにする（送信時に一括反映）
+    with st.form("sorter_inputs", clear_on_submit=False):
+        col1, col2 = st.columns(2)
 
-    with col2:
-        st.markdown("#### 商品平均仕様")
-
-        col2_1, col2_2 = st.columns(2)
-        with col2_1:
-            product_length = st.number_input(
-                "長さ (mm)",
-                min_value=50,
-                max_value=1500,
-                value=ui_defaults.get('product_length', 300),
-                step=10,
-                key="input_product_length",
-                help="商品の最大長さ"
+        with col1:
+            st.markdown("#### 基本情報")
+            company_name = st.text_input(
+                "会社名",
+                placeholder="例：株式会社サンプル",
+                key="input_company_name"
             )
-            product_width = st.number_input(
-                "幅 (mm)",
-                min_value=50,
-                max_value=1000,
-                value=ui_defaults.get('product_width', 200),
-                step=10,
-                key="input_product_width",
-                help="商品の最大幅"
+            industry = st.selectbox(
+                "業界",
+                ["EC・通販", "小売・卸売", "食品", "アパレル", "医薬品", "製造業", "3PL", "その他"],
+                key="input_industry"
+            )
+            business_type = st.selectbox(
+                "事業形態",
+                ["B2C（toC）", "B2B（toB）", "B2B2C", "その他"],
+                key="input_business_type"
             )
 
-        with col2_2:
-            product_height = st.number_input(
-                "高さ (mm)",
-                min_value=10,
-                max_value=600,
-                value=ui_defaults.get('product_height', 150),
+            st.markdown("#### 運用条件")
+            daily_orders = st.number_input(
+                "平均日次出荷件数",
+                min_value=1,
+                max_value=50000,
+                value=ui_defaults.get('daily_orders', 1000),
                 step=10,
-                key="input_product_height",
-                help="商品の最大高さ"
+                key="input_daily_orders",
+                help="1日あたりの出荷件数を入力"
             )
-            product_weight = st.number_input(
-                "平均重量 (kg)",
+
+            pieces_per_order = st.number_input(
+                "平均ピース数/件",
                 min_value=0.1,
-                max_value=10.0,
-                value=ui_defaults.get('product_weight', 1.5),
+                max_value=1000.0,
+                value=ui_defaults.get('pieces_per_order', 2.0),
                 step=0.1,
-                key="input_product_weight",
-                help="商品の最大重量（Lサイズは8kgまで対応）"
+                key="input_pieces_per_order",
+                help="1件あたりの平均商品点数"
             )
 
-        container_type = st.selectbox(
-            "出荷容器タイプ",
-            ["OS標準トート", "オリコン30L", "オリコン40L", "オリコン50L", "その他"],
-            key="input_container_type"
-        )
+            working_hours = st.number_input(
+                "作業可能時間/日（時間）",
+                min_value=1.0,
+                max_value=24.0,
+                value=ui_defaults.get('working_hours', 8.0),
+                step=1.0,
+                key="input_working_hours",
+                help="1日で仕分けにとれる作業可能時間"
+            )
 
-        st.markdown("#### 追加情報（任意）")
-        peak_ratio_options = ui_defaults.get('peak_ratio_options', [1.0, 1.2, 1.5, 2.0, 2.5, 3.0])
-        peak_ratio = st.selectbox(
-            "ピーク倍率",
-            options=peak_ratio_options,
-            index=0,  # デフォルト: 1.0
-            format_func=lambda x: f"{x:.1f}倍",
-            key="input_peak_ratio",
-            help="通常時に対するピーク時の倍率"
-        )
+        with col2:
+            st.markdown("#### 商品平均仕様")
+
+            col2_1, col2_2 = st.columns(2)
+            with col2_1:
+                product_length = st.number_input(
+                    "長さ (mm)",
+                    min_value=50,
+                    max_value=1500,
+                    value=ui_defaults.get('product_length', 300),
+                    step=10,
+                    key="input_product_length",
+                    help="商品の最大長さ"
+                )
+                product_width = st.number_input(
+                    "幅 (mm)",
+                    min_value=50,
+                    max_value=1000,
+                    value=ui_defaults.get('product_width', 200),
+                    step=10,
+                    key="input_product_width",
+                    help="商品の最大幅"
+                )
+
+            with col2_2:
+                product_height = st.number_input(
+                    "高さ (mm)",
+                    min_value=10,
+                    max_value=600,
+                    value=ui_defaults.get('product_height', 150),
+                    step=10,
+                    key="input_product_height",
+                    help="商品の最大高さ"
+                )
+                product_weight = st.number_input(
+                    "平均重量 (kg)",
+                    min_value=0.1,
+                    max_value=10.0,
+                    value=ui_defaults.get('product_weight', 1.5),
+                    step=0.1,
+                    key="input_product_weight",
+                    help="商品の最大重量（Lサイズは8kgまで対応）"
+                )
+
+            container_type = st.selectbox(
+                "出荷容器タイプ",
+                ["OS標準トート", "オリコン30L", "オリコン40L", "オリコン50L", "その他"],
+                key="input_container_type"
+            )
 
-    return {
-        'company_name': company_name,
-        'industry': industry,
-        'business_type': business_type,
-        'daily_orders': daily_orders,
-        'pieces_per_order': pieces_per_order,
-        'working_hours': working_hours,
-        'product_length': product_length,
-        'product_width': product_width,
-        'product_height': product_height,
-        'product_weight': product_weight,
-        'container_type': container_type,
-        'peak_ratio': peak_ratio
-    }
+            st.markdown("#### 追加情報（任意）")
+            peak_ratio_options = ui_defaults.get('peak_ratio_options', [1.0, 1.2, 1.5, 2.0, 2.5, 3.0])
+            peak_ratio = st.selectbox(
+                "ピーク倍率",
+                options=peak_ratio_options,
+                index=0,  # デフォルト: 1.0
+                format_func=lambda x: f"{x:.1f}倍",
+                key="input_peak_ratio",
+                help="通常時に対するピーク時の倍率"
+            )
+
+        # 計算実行
+        st.markdown("---")
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            submitted = st.form_submit_button(
+                "🚀 シミュレーションを開始！",
+                type="primary",
+                use_container_width=True
+            )
+
+    params = SimulationParams(
+        company_name=company_name,
+        industry=industry,
+        business_type=business_type,
+        daily_orders=daily_orders,
+        pieces_per_order=pieces_per_order,
+        working_hours=working_hours,
+        product_length=product_length,
+        product_width=product_width,
+        product_height=product_height,
+        product_weight=product_weight,
+        container_type=container_type,
+        peak_ratio=peak_ratio
+    )
+    return params, submitted
 
 
 def calculate_omnisorter_spec(params):
+    """OmniSorter仕様の計算（同一パラメータの再計算はキャッシュを返す）
+
+    計算ロジックは _calculate_omnisorter_spec_cached を参照。
+    デバッグ情報はセッションに保存する。
+    """
+    result, debug_info = _calculate_omnisorter_spec_cached(params)
+    st.session_state['debug_info'] = debug_info
+    return result
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _calculate_omnisorter_spec_cached(params):
     """OmniSorter仕様の計算
 
+    戻り値は (計算結果, デバッグ情報) のタプル。適合機種がない場合の計算結果は None。
+
     計算ロジック:
     1. 必要処理能力（pcs/h）と必要件数（件/h）を算出
     2. 機種の処理能力で対応可能かを判定
@@ -262,239 +416,158 @@ def calculate_omnisorter_spec(params):
 
     パラメータは config/app_settings.yaml から読み込み
     """
-    PRODUCT_SPECS = get_omnisorter_specs()
-    CONTAINER_MODEL_MATRIX = get_container_matrix()
+    PRODUCT_SPECS = _cached_specs()
+    CONTAINER_MODEL_MATRIX = _cached_matrix()
 
     # 設定から計算パラメータを取得
-    calc_settings = APP_SETTINGS.get('calculation', {})
-    scoring_settings = APP_SETTINGS.get('scoring', {})
+    calc_settings = _resolve_calc_settings()
 
-    TARGET_UTILIZATION = calc_settings.get('target_utilization', 0.95)
-    TARGET_ROTATION = max(1, calc_settings.get('target_rotation', 5))  # 目標回転数（最小1）
-    MAX_UNITS = calc_settings.get('max_units', 2)  # 台数上限（デフォルト2台）
+    TARGET_UTILIZATION = calc_settings['target_utilization']
+    TARGET_ROTATION = calc_settings['target_rotation']
+    MAX_UNITS = calc_settings['max_units']
 
-    # デバッグ: 設定値を表示（UIにも出力）
+    # デバッグ情報は設定 debug: true の場合のみ生成する
+    DEBUG = calc_settings['debug']
     debug_info = []
-    debug_info.append(f"MAX_UNITS: {MAX_UNITS}")
-    debug_info.append(f"入力: {params['daily_orders']}件×{params['pieces_per_order']}pcs, {params['working_hours']}h, peak={params['peak_ratio']}")
-    debug_info.append(f"商品: {params['product_length']}x{params['product_width']}x{params['product_height']}mm")
 
     # 必要処理能力の計算
-    daily_pieces = params['daily_orders'] * params['pieces_per_order']
-    daily_orders = params['daily_orders']
-    working_hours = params['working_hours']
-    peak_ratio = params['peak_ratio']
+    daily_pieces = params.daily_orders * params.pieces_per_order
+    daily_orders = params.daily_orders
+    working_hours = params.working_hours
+    peak_ratio = params.peak_ratio
 
     # 時間あたり必要処理能力
     required_pcs_per_hour = (daily_pieces / working_hours) * peak_ratio
     required_orders_per_hour = (daily_orders / working_hours) * peak_ratio
 
-    debug_info.append(f"必要能力: {required_pcs_per_hour:.0f} pcs/h, {required_orders_per_hour:.0f} 件/h")
+    # デバッグ: 設定値を表示（UIにも出力）
+    if DEBUG:
+        debug_info.append(f"MAX_UNITS: {MAX_UNITS}")
+        debug_info.append(f"入力: {params.daily_orders}件×{params.pieces_per_order}pcs, {params.working_hours}h, peak={params.peak_ratio}")
+        debug_info.append(f"商品: {params.product_length}x{params.product_width}x{params.product_height}mm")
+        debug_info.append(f"必要能力: {required_pcs_per_hour:.0f} pcs/h, {required_orders_per_hour:.0f} 件/h")
+
+    # 機種選定ロジック（機種ごとの判定・スコアを配列演算で一括評価）
+    spec_arrays = _build_spec_arrays()
+    model_names = spec_arrays['names']
+    max_L = spec_arrays['max_L']
+    max_W = spec_arrays['max_W']
+    max_H = spec_arrays['max_H']
+    max_weight = spec_arrays['max_weight']
+    is_mini = spec_arrays['is_mini']
+
+    # 物理制約チェック（L/W/H: mm、weight: g）
+    # 入力の重量はkg、設定はgのため1000倍して比較
+    # 長さと幅は回転を考慮（どちらの向きでも入ればOK）
+    product_weight_g = params.product_weight * 1000  # kg → g
+    prod_L = params.product_length
+    prod_W = params.product_width
+    prod_H = params.product_height
+
+    # 回転なし: 長さ→L、幅→W
+    fits_normal = (prod_L <= max_L) & (prod_W <= max_W)
+    # 回転あり: 長さ→W、幅→L（90度回転）
+    fits_rotated = (prod_L <= max_W) & (prod_W <= max_L)
+    # どちらの向きでも入らない、または高さ・重量がオーバーなら除外
+    fits_size = (fits_normal | fits_rotated) & (prod_H <= max_H) & (product_weight_g <= max_weight)
+
+    # 容器対応チェック
+    container_configs = [
+        get_container_model_config(model_name, params.container_type, CONTAINER_MODEL_MATRIX)
+        for model_name in model_names
+    ]
+    container_supported = np.array(
+        [bool(config) and bool(config.get('supported')) for config in container_configs], dtype=bool
+    )
+    container_recommended = np.array(
+        [bool(config) and bool(config.get('recommended')) for config in container_configs], dtype=bool
+    )
+    # 容器タイプごとのports_per_blockを優先（例：オリコン50Lは24間口/ブロック）
+    ports_per_block = np.array([
+        config.get('ports_per_block', default) if config else default
+        for config, default in zip(container_configs, spec_arrays['ports_per_block'])
+    ], dtype=int)
+
+    # 目標回転数を使用した間口数計算
+    # 間口数 = 必要件数/時 ÷ 目標回転数
+    # 目標回転数: 1間口が1時間に何件処理するかの目標値
+    effective_rotation = TARGET_ROTATION
+    min_ports_needed = math.ceil(required_orders_per_hour / effective_rotation)
+
+    # 機種優先度（事前計算済み。mini は日次処理量で切り替え）
+    priority_small, priority_large = _build_base_priority()
+    base_score = priority_small if daily_pieces <= calc_settings['mini_threshold'] else priority_large
+
+    # 容器適合度
+    base_score = base_score + np.where(container_recommended, calc_settings['container_recommended_bonus'], 0)
+
+    # 必要台数・間口構成・稼働率・スコアを一括計算
+    (units_by_capacity, units_by_ports, recommended_units, num_blocks,
+     num_intervals, capacity_utilization, actual_rotation, score) = score_models(
+        spec_arrays['processing_capacity'],
+        spec_arrays['total_ports'],
+        ports_per_block,
+        spec_arrays['min_blocks'],
+        spec_arrays['max_blocks'],
+        spec_arrays['mini_blocks'],
+        is_mini,
+        base_score,
+        required_pcs_per_hour,
+        required_orders_per_hour,
+        TARGET_UTILIZATION,
+        effective_rotation,
+        calc_settings['scoring']
+    )
+
+    # 台数上限チェック: 上限を超える機種は候補から除外
+    within_max_units = recommended_units <= MAX_UNITS
+    candidates = fits_size & container_supported & within_max_units
+
+    # デバッグ情報（機種ごとの判定結果）
+    if DEBUG:
+        for i, model_name in enumerate(model_names):
+            if not fits_size[i]:
+                debug_info.append(f"{model_name}: SKIP(サイズ) max={max_L[i]:g}x{max_W[i]:g}x{max_H[i]:g}mm")
+            elif not container_supported[i]:
+                debug_info.append(f"{model_name}: SKIP(容器非対応) {params.container_type}")
+            elif not within_max_units[i]:
+                debug_info.append(f"{model_name}: SKIP(台数超過) {recommended_units[i]}台 > MAX={MAX_UNITS}")
+                debug_info.append(f"  └ capacity:{int(units_by_capacity[i])}台, ports:{int(units_by_ports[i])}台")
+            else:
+                debug_info.append(f"{model_name}: PASS {recommended_units[i]}台 <= MAX={MAX_UNITS}")
+                debug_info.append(f"  └ 目標回転:{effective_rotation}回/h, 必要間口:{int(min_ports_needed)}口")
 
-    # 機種選定ロジック
+    # 最高スコアの機種を選択（同点の場合は定義順で先の機種）
     selected_model = None
     best_score = float('-inf')  # 負のスコアでも選択できるように
     best_calculation = None
 
-    for model_name, spec in PRODUCT_SPECS.items():
-        # 物理制約チェック（L/W/H: mm、weight: g）
-        # 入力の重量はkg、設定はgのため1000倍して比較
-        # 長さと幅は回転を考慮（どちらの向きでも入ればOK）
-        max_product = spec.get('maxProduct', {})
-        product_weight_g = params['product_weight'] * 1000  # kg → g
-
-        max_L = max_product.get('L', 9999)
-        max_W = max_product.get('W', 9999)
-        max_H = max_product.get('H', 9999)
-        max_weight = max_product.get('weight', 9999)
-
-        prod_L = params['product_length']
-        prod_W = params['product_width']
-        prod_H = params['product_height']
-
-        # 回転なし: 長さ→L、幅→W
-        fits_normal = (prod_L <= max_L) and (prod_W <= max_W)
-        # 回転あり: 長さ→W、幅→L（90度回転）
-        fits_rotated = (prod_L <= max_W) and (prod_W <= max_L)
-
-        # どちらの向きでも入らない、または高さ・重量がオーバーなら除外
-        if (not fits_normal and not fits_rotated) or prod_H > max_H or product_weight_g > max_weight:
-            debug_info.append(f"{model_name}: SKIP(サイズ) max={max_L}x{max_W}x{max_H}mm")
-            continue
-
-        # 容器対応チェック
-        container_config = get_container_model_config(
-            model_name,
-            params['container_type'],
-            CONTAINER_MODEL_MATRIX
-        )
-
-        if not container_config or not container_config.get('supported'):
-            debug_info.append(f"{model_name}: SKIP(容器非対応) {params['container_type']}")
-            continue
-
-        # 機種の処理能力
-        processing_capacity = spec.get('processingCapacity', 1200)
-
-        # 処理能力チェック: 1台で対応できない場合は複数台必要
-        # 有効処理能力 = 処理能力 × 稼働率
-        effective_capacity_per_unit = processing_capacity * TARGET_UTILIZATION
-
-        # 必要台数の計算（処理能力ベース）
-        units_by_capacity = np.ceil(required_pcs_per_hour / effective_capacity_per_unit)
-
-        # 1件あたりの処理時間（秒）
-        pieces_per_order = params['pieces_per_order']
-        seconds_per_pcs = 3600 / processing_capacity
-        seconds_per_order = pieces_per_order * seconds_per_pcs
-
-        # 処理能力ベースの件数/時/台
-        orders_per_hour_per_unit = effective_capacity_per_unit / pieces_per_order
-
-        # 目標回転数を使用した間口数計算
-        # 間口数 = 必要件数/時 ÷ 目標回転数
-        # 目標回転数: 1間口が1時間に何件処理するかの目標値
-        effective_rotation = TARGET_ROTATION
-        min_ports_needed = np.ceil(required_orders_per_hour / effective_rotation)
-
-        # 必要台数の計算（処理能力と間口数の両方を考慮）
-        # 1台あたりの間口数上限
-        total_ports = spec.get('totalPorts', 200)
-        # 容器タイプごとのports_per_blockを優先（例：オリコン50Lは24間口/ブロック）
-        ports_per_block = container_config.get('ports_per_block', spec.get('portsPerBlock', 40))
-
-        # mini機種の場合は固定構成
-        if 'mini' in model_name.lower():
-            max_ports_per_unit = total_ports
-            is_mini = True
-        else:
-            max_ports_per_unit = total_ports
-            is_mini = False
-
-        # 間口数による必要台数
-        units_by_ports = np.ceil(min_ports_needed / max_ports_per_unit)
-
-        # 最終的な必要台数（処理能力と間口数の大きい方）
-        recommended_units = int(max(units_by_capacity, units_by_ports))
-
-        # 台数上限チェック: 上限を超える場合はこの機種をスキップ
-        if recommended_units > MAX_UNITS:
-            debug_info.append(f"{model_name}: SKIP(台数超過) {recommended_units}台 > MAX={MAX_UNITS}")
-            debug_info.append(f"  └ capacity:{int(units_by_capacity)}台, ports:{int(units_by_ports)}台")
-            continue
-
-        debug_info.append(f"{model_name}: PASS {recommended_units}台 <= MAX={MAX_UNITS}")
-        debug_info.append(f"  └ 目標回転:{effective_rotation}回/h, 必要間口:{int(min_ports_needed)}口")
-
-        # 1台あたりの間口数
-        if recommended_units > 0:
-            ports_per_unit = int(np.ceil(min_ports_needed / recommended_units))
-        else:
-            ports_per_unit = int(min_ports_needed)
-
-        # 間口数を上限内に収める
-        ports_per_unit = min(ports_per_unit, max_ports_per_unit)
-
-        # ブロック数の計算
-        if is_mini:
-            num_blocks = spec.get('blocks', 2)
-            num_intervals = total_ports
-        else:
-            # ブロック数 = 間口数 ÷ ブロックあたり間口数（切り上げ）
-            num_blocks = int(np.ceil(ports_per_unit / ports_per_block))
-            # ブロック数上限チェック
-            blocks_config = spec.get('blocks', {})
-            if isinstance(blocks_config, dict):
-                max_blocks = blocks_config.get('max', 10)
-                min_blocks = blocks_config.get('min', 1)
-            else:
-                max_blocks = 10
-                min_blocks = 1
-            num_blocks = max(min_blocks, min(num_blocks, max_blocks))
-            # 実際の間口数
-            num_intervals = num_blocks * ports_per_block
-
-        # 稼働率の計算
-        total_capacity = processing_capacity * recommended_units
-        capacity_utilization = (required_pcs_per_hour / total_capacity) * 100
-
-        # 実際の回転数
-        actual_rotation = required_orders_per_hour / (num_intervals * recommended_units)
-
-        # スコア計算（設定ファイルから読み込み）
-        model_priority = scoring_settings.get('model_priority', {})
-        mini_threshold = scoring_settings.get('mini_threshold_pcs', 3000)
-        util_settings = scoring_settings.get('utilization', {})
-        cost_penalty = scoring_settings.get('cost_penalty', {})
-
-        score = 0
-
-        # 機種優先度
-        if 'mini' in model_name.lower():
-            if daily_pieces <= mini_threshold:
-                score += model_priority.get('mini_small', 150)
-            else:
-                score += model_priority.get('mini_large', 10)
-        elif model_name == 'S':
-            score += model_priority.get('S', 100)
-        elif model_name == 'M':
-            score += model_priority.get('M', 50)
-        elif model_name == 'L':
-            score += model_priority.get('L', 25)
-
-        # 容器適合度
-        if container_config.get('recommended'):
-            score += scoring_settings.get('container_recommended_bonus', 20)
-
-        # 稼働率適合度
-        optimal_min = util_settings.get('optimal_min', 60)
-        optimal_max = util_settings.get('optimal_max', 85)
-        high_max = util_settings.get('high_max', 95)
-
-        if optimal_min <= capacity_utilization <= optimal_max:
-            score += util_settings.get('optimal_bonus', 15)
-        elif optimal_max < capacity_utilization <= high_max:
-            score += util_settings.get('high_bonus', 10)
-        elif capacity_utilization > 100:
-            score += util_settings.get('overload_penalty', -10)
-
-        # コストペナルティ
-        units_penalty = cost_penalty.get('units_penalty', 30)
-        ports_penalty = cost_penalty.get('ports_penalty', 0.1)
-        ports_baseline = cost_penalty.get('ports_baseline', 40)
-
-        score -= (recommended_units - 1) * units_penalty
-        score -= (num_intervals - ports_baseline) * ports_penalty
-
-        if score > best_score:
-            best_score = score
-            selected_model = {
-                'name': model_name,
-                'spec': spec,
-                'container_config': container_config,
-                'score': score
-            }
-            best_calculation = {
-                'num_intervals': num_intervals,
-                'num_blocks': num_blocks,
-                'recommended_units': recommended_units,
-                'capacity_utilization': capacity_utilization,
-                'actual_rotation': actual_rotation,
-                'effective_rotation': effective_rotation,
-                'min_ports_needed': min_ports_needed,
-                'seconds_per_order': seconds_per_order,
-                'orders_per_hour_per_unit': orders_per_hour_per_unit
-            }
+    if candidates.any():
+        best_index = int(np.argmax(np.where(candidates, score, -np.inf)))
+        best_score = float(score[best_index])
+        selected_model = {
+            'name': model_names[best_index],
+            'spec': PRODUCT_SPECS[model_names[best_index]],
+            'container_config': container_configs[best_index],
+            'score': best_score
+        }
+        best_calculation = {
+            'num_intervals': int(num_intervals[best_index]),
+            'num_blocks': int(num_blocks[best_index]),
+            'recommended_units': int(recommended_units[best_index]),
+            'capacity_utilization': float(capacity_utilization[best_index]),
+            'actual_rotation': float(actual_rotation[best_index]),
+            'effective_rotation': effective_rotation,
+            'min_ports_needed': min_ports_needed
+        }
 
     if not selected_model:
-        debug_info.append(f"=== 適合機種なし (MAX_UNITS={MAX_UNITS}) ===")
-        # デバッグ情報をセッションに保存
-        st.session_state['debug_info'] = debug_info
-        return None
+        if DEBUG:
+            debug_info.append(f"=== 適合機種なし (MAX_UNITS={MAX_UNITS}) ===")
+        return None, debug_info
 
-    debug_info.append(f"=== 選択: {selected_model['name']} (score={best_score}) ===")
-    # デバッグ情報をセッションに保存
-    st.session_state['debug_info'] = debug_info
+    if DEBUG:
+        debug_info.append(f"=== 選択: {selected_model['name']} (score={best_score}) ===")
 
     # 選択された機種の計算結果を使用
     spec = selected_model['spec']
@@ -511,48 +584,18 @@ def calculate_omnisorter_spec(params):
     installation_height = dimensions.get('H', 2.5) * 1000
 
     # 代替案の生成（上位3つ）
-    alternatives = []
-    product_weight_g = params['product_weight'] * 1000  # kg → g
-
-    for model_name, spec_alt in PRODUCT_SPECS.items():
-        if model_name == selected_model['name']:
-            continue
-
-        # 物理制約チェック（回転考慮）
-        max_product_alt = spec_alt.get('maxProduct', {})
-        max_L_alt = max_product_alt.get('L', 9999)
-        max_W_alt = max_product_alt.get('W', 9999)
-        max_H_alt = max_product_alt.get('H', 9999)
-        max_weight_alt = max_product_alt.get('weight', 9999)
-
-        prod_L = params['product_length']
-        prod_W = params['product_width']
-        prod_H = params['product_height']
-
-        # 回転を考慮した適合チェック
-        fits_normal_alt = (prod_L <= max_L_alt) and (prod_W <= max_W_alt)
-        fits_rotated_alt = (prod_L <= max_W_alt) and (prod_W <= max_L_alt)
-
-        if ((fits_normal_alt or fits_rotated_alt) and
-            prod_H <= max_H_alt and
-            product_weight_g <= max_weight_alt):
-
-            container_config_alt = get_container_model_config(
-                model_name,
-                params['container_type'],
-                CONTAINER_MODEL_MATRIX
-            )
-
-            if container_config_alt and container_config_alt.get('supported'):
-                alternatives.append({
-                    'name': model_name,
-                    'spec': spec_alt,
-                    'container_config': container_config_alt
-                })
-
-    alternatives = alternatives[:3]
+    # 選定時に求めたサイズ・容器の適合判定を再利用する（台数上限は問わない）
+    alternatives = [
+        {
+            'name': model_names[i],
+            'spec': PRODUCT_SPECS[model_names[i]],
+            'container_config': container_configs[i]
+        }
+        for i in np.flatnonzero(fits_size & container_supported)
+        if i != best_index
+    ][:3]
 
-    return {
+    result = {
         'selected_model': selected_model,
         'num_intervals': num_intervals,
         'num_blocks': num_blocks,
@@ -571,49 +614,194 @@ def calculate_omnisorter_spec(params):
         'min_ports_needed': best_calculation['min_ports_needed']
     }
 
+    return result, debug_info
 
-def render_no_match_guidance(params):
-    """適合機種がない場合のガイダンス表示"""
-    st.markdown("""
-    <style>
-    .no-match-section {
-        background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        border-left: 4px solid #FF6B35;
+
+def reload_configs():
+    """設定ファイルを読み直す（設定ファイルを編集した後に使用）
+
+    ローダーのキャッシュに加え、app.py 側で保持している設定・派生配列・
+    計算結果のキャッシュを全て破棄し、APP_SETTINGS を読み込み直す。
+    """
+    global APP_SETTINGS
+    clear_config_cache()
+    for cached in (_cached_app_settings, _cached_specs, _cached_matrix,
+                   _build_spec_arrays, _resolve_calc_settings, _build_base_priority,
+                   _calculate_omnisorter_spec_cached):
+        cached.clear()
+    APP_SETTINGS = _cached_app_settings()
+
+
+def _minify_css(css):
+    """CSSのコメントと余分な空白を除去"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};])\s*', r'\1', css).strip()
+
+
+# 適合機種なしガイダンス用CSS（読み込み時に一度だけ圧縮し、ガイダンス表示時のみ出力する）
+_NO_MATCH_CSS = "<style>" + _minify_css("""
+.no-match-section {
+    background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+    border-radius: 12px;
+    padding: 1.5rem;
+    margin: 1rem 0;
+    border-left: 4px solid #FF6B35;
+}
+.no-match-title {
+    color: #333;
+    margin: 0 0 1rem 0;
+    font-size: 1.3rem;
+}
+.no-match-text {
+    color: #555;
+    margin: 0.5rem 0;
+    font-size: 0.95rem;
+    line-height: 1.6;
+}
+.solution-card {
+    background: white;
+    border-radius: 8px;
+    padding: 1rem;
+    margin: 0.5rem 0;
+    border: 1px solid #dee2e6;
+}
+.solution-title {
+    color: #333;
+    font-weight: bold;
+    margin: 0 0 0.3rem 0;
+    font-size: 0.95rem;
+}
+.solution-desc {
+    color: #666;
+    margin: 0;
+    font-size: 0.85rem;
+}
+""") + "</style>"
+
+# 結果表示用CSS（ヒーロー・指標カード）
+# 読み込み時に一度だけ連結・圧縮し、結果表示のたびに1回だけ出力する
+_RESULTS_CSS = "<style>" + _minify_css("""
+/* 推奨機種ヒーローセクション */
+.hero-section {
+    background: linear-gradient(135deg, #FF6B35 0%, #F7931E 100%);
+    border-radius: 12px;
+    padding: 1rem 1.5rem;
+    margin: 0.5rem 0 1rem 0;
+    box-shadow: 0 3px 10px rgba(255, 107, 53, 0.25);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    gap: 1.5rem;
+}
+.hero-image {
+    flex-shrink: 0;
+    width: 280px;
+    height: 180px;
+    object-fit: contain;
+    border-radius: 8px;
+    background: rgba(255,255,255,0.15);
+    padding: 8px;
+}
+.hero-content {
+    text-align: left;
+    flex: 1;
+    min-width: 200px;
+}
+.hero-label {
+    color: rgba(255,255,255,0.9);
+    margin: 0;
+    font-size: 0.8rem;
+    font-weight: 500;
+}
+.hero-title {
+    color: white;
+    margin: 0.3rem 0;
+    font-size: 1.6rem;
+    font-weight: bold;
+    line-height: 1.2;
+}
+.hero-specs {
+    color: rgba(255,255,255,0.9);
+    margin: 0;
+    font-size: 0.85rem;
+    line-height: 1.4;
+}
+/* タブレット */
+@media (max-width: 768px) {
+    .hero-section {
+        flex-direction: column;
+        padding: 1rem;
+        gap: 0.8rem;
+    }
+    .hero-image {
+        width: 220px;
+        height: 140px;
     }
-    .no-match-title {
-        color: #333;
-        margin: 0 0 1rem 0;
+    .hero-content {
+        text-align: center;
+    }
+    .hero-title {
         font-size: 1.3rem;
     }
-    .no-match-text {
-        color: #555;
-        margin: 0.5rem 0;
-        font-size: 0.95rem;
-        line-height: 1.6;
+    .hero-specs {
+        font-size: 0.8rem;
     }
-    .solution-card {
-        background: white;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border: 1px solid #dee2e6;
+}
+/* スマホ */
+@media (max-width: 480px) {
+    .hero-section {
+        padding: 0.8rem;
+        gap: 0.6rem;
     }
-    .solution-title {
-        color: #333;
-        font-weight: bold;
-        margin: 0 0 0.3rem 0;
-        font-size: 0.95rem;
+    .hero-image {
+        width: 180px;
+        height: 110px;
     }
-    .solution-desc {
-        color: #666;
-        margin: 0;
-        font-size: 0.85rem;
+    .hero-title {
+        font-size: 1.1rem;
     }
-    </style>
-    """, unsafe_allow_html=True)
+    .hero-specs {
+        font-size: 0.75rem;
+    }
+}
+/* 主要指標カード */
+.metric-card {
+    background: #f8f9fa;
+    border-radius: 8px;
+    padding: 0.8rem;
+    text-align: center;
+    border-left: 3px solid;
+}
+.metric-label {
+    color: #666;
+    margin: 0;
+    font-size: 0.75rem;
+}
+.metric-value {
+    margin: 0.2rem 0;
+    font-size: 1.5rem;
+    font-weight: bold;
+}
+.metric-unit {
+    color: #888;
+    margin: 0;
+    font-size: 0.75rem;
+}
+@media (max-width: 768px) {
+    .metric-value {
+        font-size: 1.2rem;
+    }
+    .metric-label, .metric-unit {
+        font-size: 0.7rem;
+    }
+}
+""") + "</style>"
+
+
+def render_no_match_guidance(params):
+    """適合機種がない場合のガイダンス表示"""
+    st.markdown(_NO_MATCH_CSS, unsafe_allow_html=True)
 
     st.markdown("""
     <div class="no-match-section">
@@ -682,23 +870,23 @@ def render_no_match_guidance(params):
     with col1:
         st.markdown(f"""
         **運用条件**
-        - 日次出荷: {params['daily_orders']:,} 件/日
-        - 平均ピース数: {params['pieces_per_order']:.1f} pcs/件
-        - 作業時間: {params['working_hours']} 時間/日
+        - 日次出荷: {params.daily_orders:,} 件/日
+        - 平均ピース数: {params.pieces_per_order:.1f} pcs/件
+        - 作業時間: {params.working_hours} 時間/日
         """)
     with col2:
         st.markdown(f"""
         **商品サイズ**
-        - 長さ: {params['product_length']} mm
-        - 幅: {params['product_width']} mm
-        - 高さ: {params['product_height']} mm
+        - 長さ: {params.product_length} mm
+        - 幅: {params.product_width} mm
+        - 高さ: {params.product_height} mm
         """)
     with col3:
         st.markdown(f"""
         **その他**
-        - 重量: {params['product_weight']} kg
-        - 容器: {params['container_type']}
-        - ピーク倍率: {params['peak_ratio']:.1f}倍
+        - 重量: {params.product_weight} kg
+        - 容器: {params.container_type}
+        - ピーク倍率: {params.peak_ratio:.1f}倍
         """)
 
     # 問い合わせ誘導ボタン
@@ -734,12 +922,132 @@ def render_no_match_guidance(params):
     st.info("💡 **ヒント**: 下記の問い合わせフォームから送信いただくと、入力条件が自動で送信されます。")
 
 
+# 結果表示テーブルの項目名（表示のたびに作り直さない）
+_SPEC_LABELS = ("処理能力", "間口数", "ブロック数")
+_SIZE_LABELS = ("最大長さ", "最大幅", "最大高さ", "最大重量")
+_INPUT_LABELS = ("日次出荷件数", "平均ピース数/件", "作業時間", "ピーク倍率")
+_CONTAINER_LABELS = ("容器タイプ", "対応状況", "推奨度")
+_CALC_LABELS = ("必要処理能力", "必要件数/時", "目標回転数", "実回転数")
+_PORTS_LABELS = ("理論最小間口数", "構成間口数", "推奨台数", "合計間口数")
+_INSTALL_LABELS = ("長さ", "幅", "高さ")
+
+# 処理能力比較チャート（必要能力 → 実能力の順に、色分けと値ラベル付きで描画）
+_CAPACITY_CATEGORIES = ("必要能力", "実能力")
+_CAPACITY_CHART_SPEC = {
+    "height": 280,
+    "encoding": {
+        "x": {"field": "区分", "type": "nominal", "sort": None, "title": None,
+              "axis": {"labelAngle": 0}},
+        "y": {"field": "処理能力", "type": "quantitative", "title": "処理能力"},
+    },
+    "layer": [
+        {
+            "mark": {"type": "bar"},
+            "encoding": {
+                "color": {
+                    "field": "区分",
+                    "type": "nominal",
+                    "scale": {"domain": list(_CAPACITY_CATEGORIES), "range": ["#FFA500", "#FF6B35"]},
+                    "legend": None,
+                },
+            },
+        },
+        {
+            "mark": {"type": "text", "baseline": "bottom", "dy": -4},
+            "encoding": {"text": {"field": "処理能力", "type": "quantitative", "format": ",.0f"}},
+        },
+    ],
+}
+
+
+def _render_table(labels, values, value_header="値"):
+    """項目・値の小さな表をHTMLテーブルとして表示（Markdown解析を経由しない）"""
+    rows = "".join(
+        f"<tr><td>{html.escape(label)}</td><td>{html.escape(str(value))}</td></tr>"
+        for label, value in zip(labels, values)
+    )
+    st.markdown(
+        f'<table class="compact-table"><thead><tr><th>項目</th><th>{value_header}</th></tr></thead>'
+        f"<tbody>{rows}</tbody></table>",
+        unsafe_allow_html=True
+    )
+
+
+# 稼働率ゲージのステータス（低稼働 / 適正 / 高負荷 / 過負荷）と色
+_GAUGE_STATUSES = (
+    ("△ 低稼働", "#6c757d"),
+    ("✅ 適正", "#28a745"),
+    ("△ 高負荷", "#ffc107"),
+    ("⚠️ 過負荷", "#dc3545"),
+)
+# 60%ちょうどを「適正」に含めるため、bisect_left 用に直前の浮動小数点値を下限にする
+_GAUGE_LOW_BOUND = math.nextafter(60, -math.inf)
+
+
+def _gauge_status(util_value, warning_threshold, danger_threshold):
+    """稼働率からゲージのステータスと色を求める（警告・危険閾値ちょうどは下側の区分）"""
+    idx = bisect.bisect_left((_GAUGE_LOW_BOUND, warning_threshold, danger_threshold), util_value)
+    return _GAUGE_STATUSES[idx]
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _make_gauge_fig(util_value, gauge_status, status_color, warning_threshold, danger_threshold):
+    """稼働率ゲージを生成（入力値が同じ場合はキャッシュを返す）
+
+    Figure は再構築・アンピクルのコストが大きいため、cache_data ではなく
+    cache_resource で同一オブジェクトを共有する（生成後は変更しないこと）。
+    """
+    # plotly は読み込みが重いため、結果表示時に初めて読み込む
+    import plotly.graph_objects as go
+
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=util_value,
+        number={'suffix': '%', 'font': {'size': 28}},
+        domain={'x': [0, 1], 'y': [0, 0.85]},
+        title={
+            'text': f"稼働率<br><span style='font-size:0.85em;color:{status_color}'>{gauge_status}</span>",
+            'font': {'size': 16}
+        },
+        gauge={
+            'axis': {'range': [None, 120]},
+            'bar': {'color': "#FF6B35"},
+            'steps': [
+                {'range': [0, 60], 'color': "lightgray"},
+                {'range': [60, warning_threshold], 'color': "lightgreen"},
+                {'range': [warning_threshold, danger_threshold], 'color': "yellow"},
+                {'range': [danger_threshold, 120], 'color': "red"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': danger_threshold
+            }
+        }
+    ))
+
+    fig_gauge.update_layout(height=250, margin=dict(t=60, b=10, l=20, r=20))
+    return fig_gauge
+
+
 def render_results(result, params):
     """計算結果の表示"""
     if not result:
         render_no_match_guidance(params)
         return
 
+    st.markdown(_RESULTS_CSS, unsafe_allow_html=True)
+
+    # 結果の参照を一度だけ取り出す
+    selected_model = result['selected_model']
+    spec = selected_model['spec']
+    units = result['recommended_units']
+    actual_capacity = result['actual_capacity']
+    required_capacity = result['required_capacity_per_hour']
+    num_intervals = result['num_intervals']
+    num_blocks = result['num_blocks']
+    util = result['capacity_utilization']
+
     # 表示設定を取得
     display_settings = APP_SETTINGS.get('display', {})
     util_thresholds = display_settings.get('utilization_thresholds', {})
@@ -748,101 +1056,13 @@ def render_results(result, params):
     # ========================================
     # 推奨機種ヒーローセクション（コンパクト・レスポンシブ対応）
     # ========================================
-    model_name = result['selected_model']['spec']['name']
-    units = result['recommended_units']
+    model_name = spec['name']
     units_text = f" × {units}台" if units > 1 else ""
 
     # 機種画像の取得
-    image_filename = result['selected_model']['spec'].get('image', '')
+    image_filename = spec.get('image', '')
     image_data = get_model_image_base64(image_filename)
 
-    # レスポンシブ対応CSS
-    st.markdown("""
-    <style>
-    .hero-section {
-        background: linear-gradient(135deg, #FF6B35 0%, #F7931E 100%);
-        border-radius: 12px;
-        padding: 1rem 1.5rem;
-        margin: 0.5rem 0 1rem 0;
-        box-shadow: 0 3px 10px rgba(255, 107, 53, 0.25);
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        gap: 1.5rem;
-    }
-    .hero-image {
-        flex-shrink: 0;
-        width: 280px;
-        height: 180px;
-        object-fit: contain;
-        border-radius: 8px;
-        background: rgba(255,255,255,0.15);
-        padding: 8px;
-    }
-    .hero-content {
-        text-align: left;
-        flex: 1;
-        min-width: 200px;
-    }
-    .hero-label {
-        color: rgba(255,255,255,0.9);
-        margin: 0;
-        font-size: 0.8rem;
-        font-weight: 500;
-    }
-    .hero-title {
-        color: white;
-        margin: 0.3rem 0;
-        font-size: 1.6rem;
-        font-weight: bold;
-        line-height: 1.2;
-    }
-    .hero-specs {
-        color: rgba(255,255,255,0.9);
-        margin: 0;
-        font-size: 0.85rem;
-        line-height: 1.4;
-    }
-    /* タブレット */
-    @media (max-width: 768px) {
-        .hero-section {
-            flex-direction: column;
-            padding: 1rem;
-            gap: 0.8rem;
-        }
-        .hero-image {
-            width: 220px;
-            height: 140px;
-        }
-        .hero-content {
-            text-align: center;
-        }
-        .hero-title {
-            font-size: 1.3rem;
-        }
-        .hero-specs {
-            font-size: 0.8rem;
-        }
-    }
-    /* スマホ */
-    @media (max-width: 480px) {
-        .hero-section {
-            padding: 0.8rem;
-            gap: 0.6rem;
-        }
-        .hero-image {
-            width: 180px;
-            height: 110px;
-        }
-        .hero-title {
-            font-size: 1.1rem;
-        }
-        .hero-specs {
-            font-size: 0.75rem;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
 
     # 画像がある場合は画像付きレイアウト、ない場合はテキストのみ
     if image_data:
@@ -853,8 +1073,8 @@ def render_results(result, params):
                 <p class="hero-label">推奨機種</p>
                 <h2 class="hero-title">🤖 {model_name}{units_text}</h2>
                 <p class="hero-specs">
-                    処理能力 {result['actual_capacity']:,.0f} pcs/時<br>
-                    {result['num_intervals']}間口/台 ｜ {result['num_blocks']}ブロック/台
+                    処理能力 {actual_capacity:,.0f} pcs/時<br>
+                    {num_intervals}間口/台 ｜ {num_blocks}ブロック/台
                 </p>
             </div>
         </div>
@@ -866,7 +1086,7 @@ def render_results(result, params):
                 <p class="hero-label">推奨機種</p>
                 <h2 class="hero-title">🤖 {model_name}{units_text}</h2>
                 <p class="hero-specs">
-                    処理能力 {result['actual_capacity']:,.0f} pcs/時 ｜ {result['num_intervals']}間口/台 ｜ {result['num_blocks']}ブロック/台
+                    処理能力 {actual_capacity:,.0f} pcs/時 ｜ {num_intervals}間口/台 ｜ {num_blocks}ブロック/台
                 </p>
             </div>
         </div>
@@ -895,46 +1115,10 @@ def render_results(result, params):
     # ========================================
     # 主要指標カード（3列・コンパクト）
     # ========================================
-    # レスポンシブCSS for metric cards
-    st.markdown("""
-    <style>
-    .metric-card {
-        background: #f8f9fa;
-        border-radius: 8px;
-        padding: 0.8rem;
-        text-align: center;
-        border-left: 3px solid;
-    }
-    .metric-label {
-        color: #666;
-        margin: 0;
-        font-size: 0.75rem;
-    }
-    .metric-value {
-        margin: 0.2rem 0;
-        font-size: 1.5rem;
-        font-weight: bold;
-    }
-    .metric-unit {
-        color: #888;
-        margin: 0;
-        font-size: 0.75rem;
-    }
-    @media (max-width: 768px) {
-        .metric-value {
-            font-size: 1.2rem;
-        }
-        .metric-label, .metric-unit {
-            font-size: 0.7rem;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
 
     col1, col2, col3 = st.columns(3)
 
     # 稼働率の色分け（設定ファイルから閾値を取得）
-    util = result['capacity_utilization']
     danger_threshold = util_thresholds.get('danger', 95)
     warning_threshold = util_thresholds.get('warning', 85)
 
@@ -970,7 +1154,7 @@ def render_results(result, params):
         st.markdown(f"""
         <div class="metric-card" style="border-color: #17a2b8;">
             <p class="metric-label">推奨台数</p>
-            <h3 class="metric-value" style="color: #333;">{result['recommended_units']}</h3>
+            <h3 class="metric-value" style="color: #333;">{units}</h3>
             <p class="metric-unit">台</p>
         </div>
         """, unsafe_allow_html=True)
@@ -984,57 +1168,41 @@ def render_results(result, params):
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**機種スペック**")
-            spec_data = pd.DataFrame({
-                "項目": ["処理能力", "間口数", "ブロック数"],
-                "値": [
-                    f"{result['actual_capacity']:,.0f} pcs/時",
-                    f"{result['num_intervals']} 間口",
-                    f"{result['num_blocks']} ブロック"
-                ]
-            })
-            st.dataframe(spec_data, use_container_width=True, hide_index=True)
+            _render_table(_SPEC_LABELS, [
+                f"{actual_capacity:,.0f} pcs/時",
+                f"{num_intervals} 間口",
+                f"{num_blocks} ブロック"
+            ])
 
         with col2:
             st.markdown("**対応商品サイズ**")
-            max_prod = result['selected_model']['spec']['maxProduct']
-            size_data = pd.DataFrame({
-                "項目": ["最大長さ", "最大幅", "最大高さ", "最大重量"],
-                "値": [
-                    f"{max_prod['L']} mm",
-                    f"{max_prod['W']} mm",
-                    f"{max_prod['H']} mm",
-                    f"{max_prod['weight'] / 1000:.0f} kg"
-                ]
-            })
-            st.dataframe(size_data, use_container_width=True, hide_index=True)
+            max_prod = spec['maxProduct']
+            _render_table(_SIZE_LABELS, [
+                f"{max_prod['L']} mm",
+                f"{max_prod['W']} mm",
+                f"{max_prod['H']} mm",
+                f"{max_prod['weight'] / 1000:.0f} kg"
+            ])
 
     with tab2:
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**入力条件**")
-            input_data = pd.DataFrame({
-                "項目": ["日次出荷件数", "平均ピース数/件", "作業時間", "ピーク倍率"],
-                "値": [
-                    f"{params['daily_orders']:,} 件",
-                    f"{params['pieces_per_order']:.1f} 個",
-                    f"{params['working_hours']} 時間",
-                    f"{params['peak_ratio']:.1f} 倍"
-                ]
-            })
-            st.dataframe(input_data, use_container_width=True, hide_index=True)
+            _render_table(_INPUT_LABELS, [
+                f"{params.daily_orders:,} 件",
+                f"{params.pieces_per_order:.1f} 個",
+                f"{params.working_hours} 時間",
+                f"{params.peak_ratio:.1f} 倍"
+            ])
 
         with col2:
             st.markdown("**容器対応**")
-            container_config = result['selected_model']['container_config']
-            container_data = pd.DataFrame({
-                "項目": ["容器タイプ", "対応状況", "推奨度"],
-                "値": [
-                    params['container_type'],
-                    "✅ 対応" if container_config.get('supported') else "❌ 非対応",
-                    "⭐ 推奨" if container_config.get('recommended') else "〇 可能"
-                ]
-            })
-            st.dataframe(container_data, use_container_width=True, hide_index=True)
+            container_config = selected_model['container_config']
+            _render_table(_CONTAINER_LABELS, [
+                params.container_type,
+                "✅ 対応" if container_config.get('supported') else "❌ 非対応",
+                "⭐ 推奨" if container_config.get('recommended') else "〇 可能"
+            ])
 
         # 計算内訳セクション
         st.markdown("---")
@@ -1044,50 +1212,38 @@ def render_results(result, params):
         with col3:
             st.markdown("**処理能力計算**")
             required_orders = result.get('required_orders_per_hour', 0)
-            calc_data = pd.DataFrame({
-                "項目": ["必要処理能力", "必要件数/時", "目標回転数", "実回転数"],
-                "値": [
-                    f"{result['required_capacity_per_hour']:,.0f} pcs/時",
-                    f"{required_orders:,.1f} 件/時",
-                    f"{result.get('effective_rotation', 0)} 回転/時",
-                    f"{result.get('actual_rotation', 0):.1f} 回転/時"
-                ]
-            })
-            st.dataframe(calc_data, use_container_width=True, hide_index=True)
+            effective_rot = result.get('effective_rotation', 0)
+            _render_table(_CALC_LABELS, [
+                f"{required_capacity:,.0f} pcs/時",
+                f"{required_orders:,.1f} 件/時",
+                f"{effective_rot} 回転/時",
+                f"{result.get('actual_rotation', 0):.1f} 回転/時"
+            ])
 
         with col4:
             st.markdown("**間口数計算**")
             min_ports = result.get('min_ports_needed', 0)
-            ports_data = pd.DataFrame({
-                "項目": ["理論最小間口数", "構成間口数", "推奨台数", "合計間口数"],
-                "値": [
-                    f"{min_ports:.0f} 間口",
-                    f"{result['num_intervals']} 間口/台",
-                    f"{result['recommended_units']} 台",
-                    f"{result['num_intervals'] * result['recommended_units']} 間口"
-                ]
-            })
-            st.dataframe(ports_data, use_container_width=True, hide_index=True)
+            _render_table(_PORTS_LABELS, [
+                f"{min_ports:.0f} 間口",
+                f"{num_intervals} 間口/台",
+                f"{units} 台",
+                f"{num_intervals * units} 間口"
+            ])
 
         # 計算式の説明
-        effective_rot = result.get('effective_rotation', 0)
         st.caption(f"""
         💡 **計算ロジック**:
-        必要処理能力 = ({params['daily_orders']:,}件 × {params['pieces_per_order']:.1f}pcs) ÷ {params['working_hours']}h × {params['peak_ratio']:.1f} = {result['required_capacity_per_hour']:,.0f} pcs/時
+        必要処理能力 = ({params.daily_orders:,}件 × {params.pieces_per_order:.1f}pcs) ÷ {params.working_hours}h × {params.peak_ratio:.1f} = {required_capacity:,.0f} pcs/時
         | 理論最小間口数 = {required_orders:.1f}件/時 ÷ 目標回転数({effective_rot}回転/時) = {min_ports:.0f}間口
         """)
 
     with tab3:
         st.markdown("**設置寸法（概算）**")
-        install_data = pd.DataFrame({
-            "項目": ["長さ", "幅", "高さ"],
-            "寸法": [
-                f"{result['installation_length']:,.0f} mm",
-                f"{result['installation_width']:,.0f} mm",
-                f"{result['installation_height']:,.0f} mm"
-            ]
-        })
-        st.dataframe(install_data, use_container_width=True, hide_index=True)
+        _render_table(_INSTALL_LABELS, [
+            f"{result['installation_length']:,.0f} mm",
+            f"{result['installation_width']:,.0f} mm",
+            f"{result['installation_height']:,.0f} mm"
+        ], value_header="寸法")
         st.caption("※ 実際の設置寸法は現地調査により決定します")
 
     # 能力チャート
@@ -1096,81 +1252,32 @@ def render_results(result, params):
 
     with col1:
         # 処理能力vs必要能力（複数台の場合は合計能力を表示）
-        units = result['recommended_units']
-        total_capacity = result['actual_capacity'] * units
-
-        fig_capacity = go.Figure()
-
-        fig_capacity.add_trace(go.Bar(
-            x=["必要能力", "実能力"],
-            y=[result['required_capacity_per_hour'], total_capacity],
-            marker=dict(color=['#FFA500', '#FF6B35']),
-            text=[f"{result['required_capacity_per_hour']:,.0f}", f"{total_capacity:,.0f}"],
-            textposition='auto'
-        ))
+        total_capacity = actual_capacity * units
 
         # タイトルに台数を反映
-        title_text = f"処理能力比較 (pcs/時)" if units == 1 else f"処理能力比較 (pcs/時) - {units}台合計"
-
-        fig_capacity.update_layout(
-            title=title_text,
-            yaxis_title="処理能力",
-            height=280,
-            showlegend=False,
-            margin=dict(t=40, b=30, l=40, r=20)
+        title_text = "処理能力比較 (pcs/時)" if units == 1 else f"処理能力比較 (pcs/時) - {units}台合計"
+        st.markdown(f"**{title_text}**")
+        st.vega_lite_chart(
+            {
+                "区分": _CAPACITY_CATEGORIES,
+                "処理能力": (required_capacity, total_capacity)
+            },
+            _CAPACITY_CHART_SPEC,
+            use_container_width=True
         )
 
-        st.plotly_chart(fig_capacity, use_container_width=True)
-
         # 複数台の場合は注記を追加
         if units > 1:
-            st.caption(f"※ 実能力は {result['actual_capacity']:,.0f} pcs/時 × {units}台 = {total_capacity:,.0f} pcs/時")
+            st.caption(f"※ 実能力は {actual_capacity:,.0f} pcs/時 × {units}台 = {total_capacity:,.0f} pcs/時")
 
     with col2:
         # 稼働率ゲージ（ステータス表示付き）
-        util_value = result['capacity_utilization']
+        util_value = util
 
         # ステータス判定
-        if util_value > danger_threshold:
-            gauge_status = "⚠️ 過負荷"
-            status_color = "#dc3545"
-        elif util_value > warning_threshold:
-            gauge_status = "△ 高負荷"
-            status_color = "#ffc107"
-        elif util_value >= 60:
-            gauge_status = "✅ 適正"
-            status_color = "#28a745"
-        else:
-            gauge_status = "△ 低稼働"
-            status_color = "#6c757d"
-
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=util_value,
-            number={'suffix': '%', 'font': {'size': 28}},
-            domain={'x': [0, 1], 'y': [0, 0.85]},
-            title={
-                'text': f"稼働率<br><span style='font-size:0.85em;color:{status_color}'>{gauge_status}</span>",
-                'font': {'size': 16}
-            },
-            gauge={
-                'axis': {'range': [None, 120]},
-                'bar': {'color': "#FF6B35"},
-                'steps': [
-                    {'range': [0, 60], 'color': "lightgray"},
-                    {'range': [60, warning_threshold], 'color': "lightgreen"},
-                    {'range': [warning_threshold, danger_threshold], 'color': "yellow"},
-                    {'range': [danger_threshold, 120], 'color': "red"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': danger_threshold
-                }
-            }
-        ))
+        gauge_status, status_color = _gauge_status(util_value, warning_threshold, danger_threshold)
 
-        fig_gauge.update_layout(height=250, margin=dict(t=60, b=10, l=20, r=20))
+        fig_gauge = _make_gauge_fig(util_value, gauge_status, status_color, warning_threshold, danger_threshold)
         st.plotly_chart(fig_gauge, use_container_width=True)
 
     # 代替案
@@ -1191,7 +1298,7 @@ def render_results(result, params):
                     st.metric("容器対応", container_status)
 
     # まとめ仕分けモードの提案（複数台の場合）
-    if result['recommended_units'] > 1:
+    if units > 1:
         st.markdown("---")
         st.markdown(f"""
         <div style="
@@ -1203,7 +1310,7 @@ def render_results(result, params):
         ">
             <h4 style="margin: 0 0 0.3rem 0; color: white; font-size: 1rem;">💡 1台で対応できる可能性があります</h4>
             <p style="margin: 0; opacity: 0.95; font-size: 0.85rem;">
-                現在 <strong>{result['recommended_units']}台</strong> 推奨ですが、
+                現在 <strong>{units}台</strong> 推奨ですが、
                 <strong>「まとめ仕分けモード」</strong>で<strong>1台運用</strong>が可能な場合があります。
             </p>
         </div>
@@ -1222,15 +1329,15 @@ def render_results(result, params):
             """)
 
             # 1台で対応できる場合のシミュレーション
-            required_pcs_h = result['required_capacity_per_hour']
-            model_capacity = result['actual_capacity']
+            required_pcs_h = required_capacity
+            model_capacity = actual_capacity
             batch_mode_max = display_settings.get('batch_mode_max_pcs', 10)
 
             # 1台で対応するために必要なpcs/投入
             # 機種の処理能力（投入回数/h）に対して必要なpcs/hを達成するための倍率
             if model_capacity > 0:
                 effective_capacity = model_capacity * 0.85  # 稼働率考慮
-                needed_pcs_per_input = np.ceil(required_pcs_h / effective_capacity)
+                needed_pcs_per_input = math.ceil(required_pcs_h / effective_capacity)
 
                 if needed_pcs_per_input <= batch_mode_max and needed_pcs_per_input > 1:
                     st.success(f"""
@@ -1239,11 +1346,11 @@ def render_results(result, params):
                     """)
 
     # 注意事項
-    if result['capacity_utilization'] > danger_threshold:
+    if util > danger_threshold:
         st.warning(f"""
-        ⚠️ **注意**: 稼働率が{danger_threshold}%を超えています（{result['capacity_utilization']:.1f}%）
+        ⚠️ **注意**: 稼働率が{danger_threshold}%を超えています（{util:.1f}%）
 
-        - 推奨台数: {result['recommended_units']}台での運用を検討してください
+        - 推奨台数: {units}台での運用を検討してください
         - またはより大型の機種への変更をご検討ください
         """)
 
@@ -1251,6 +1358,47 @@ def render_results(result, params):
     💡 **ご注意**: この試算は簡易的な目安です。正確な仕様には現地調査が必要です。お見積り・デモ見学は下記フォームからどうぞ。
     """)
 
+# メイン画面のカスタムCSS（レスポンシブ対応）
+_MAIN_CSS = "<style>" + _minify_css("""
+.main .block-container {
+    max-width: 1200px;
+    padding-top: 1rem;
+    padding-bottom: 1rem;
+}
+.stMetric {
+    background-color: #f0f2f6;
+    padding: 0.8rem;
+    border-radius: 0.5rem;
+}
+/* タブのパディング調整 */
+.stTabs [data-baseweb="tab-panel"] {
+    padding-top: 0.5rem;
+}
+/* 表のコンパクト化 */
+.compact-table {
+    width: 100%;
+    font-size: 0.85rem;
+}
+/* スマホ対応 */
+@media (max-width: 768px) {
+    .main .block-container {
+        padding-left: 1rem;
+        padding-right: 1rem;
+    }
+}
+""") + "</style>"
+
+# ヘッダー（センタリング）
+_HEADER_HTML = """
+<div style="text-align: center; margin-bottom: 1rem;">
+    <h1 style="margin: 0; font-size: 2rem;">🤖 OmniSorter かんたんシミュレーション</h1>
+    <p style="color: #666; margin: 0.5rem 0 0 0; font-size: 0.95rem;">
+        OmniSorterの機種と仕様を簡易的にシミュレーションします。<br>
+        あなたの倉庫にあう機種が5分で見つかる！
+    </p>
+</div>
+"""
+
 
 def main():
     """メイン関数"""
@@ -1258,62 +1406,16 @@ def main():
     initialize_app()
 
     # カスタムCSS（レスポンシブ対応）
-    st.markdown("""
-    <style>
-    .main .block-container {
-        max-width: 1200px;
-        padding-top: 1rem;
-        padding-bottom: 1rem;
-    }
-    .stMetric {
-        background-color: #f0f2f6;
-        padding: 0.8rem;
-        border-radius: 0.5rem;
-    }
-    /* タブのパディング調整 */
-    .stTabs [data-baseweb="tab-panel"] {
-        padding-top: 0.5rem;
-    }
-    /* データフレームのコンパクト化 */
-    .stDataFrame {
-        font-size: 0.85rem;
-    }
-    /* スマホ対応 */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding-left: 1rem;
-            padding-right: 1rem;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_MAIN_CSS, unsafe_allow_html=True)
 
     # ヘッダー（センタリング）
-    st.markdown("""
-    <div style="text-align: center; margin-bottom: 1rem;">
-        <h1 style="margin: 0; font-size: 2rem;">🤖 OmniSorter かんたんシミュレーション</h1>
-        <p style="color: #666; margin: 0.5rem 0 0 0; font-size: 0.95rem;">
-            OmniSorterの機種と仕様を簡易的にシミュレーションします。<br>
-            あなたの倉庫にあう機種が5分で見つかる！
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     # 入力フォーム
     st.markdown("---")
-    params = render_input_form()
+    params, submitted = render_input_form()
 
-    # 計算実行
-    st.markdown("---")
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        calculate_button = st.button(
-            "🚀 シミュレーションを開始！",
-            type="primary",
-            use_container_width=True
-        )
-
-    if calculate_button:
+    if submitted:
         with st.spinner("計算中..."):
             result = calculate_omnisorter_spec(params)
             # 計算結果を保存（Noneの場合も保存して、no-match guidanceを表示）
@@ -1335,8 +1437,13 @@ def main():
     st.markdown("---")
     st.markdown('<div id="contact-form"></div>', unsafe_allow_html=True)
     st.markdown("---")
+    # 問い合わせフォームはページ下部でのみ使うため、ここで読み込む（初回表示を遅らせない）
+    from src.contact_form import render_contact_form
+
     # 試算結果があれば問い合わせフォームに渡す
     inquiry_params = st.session_state.get('last_params', None)
+    if inquiry_params is not None:
+        inquiry_params = inquiry_params._asdict()
     inquiry_result = st.session_state.get('last_result', None)
     render_contact_form(params=inquiry_params, result=inquiry_result)
 
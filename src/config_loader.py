@@ -4,10 +4,15 @@ OmniSorter 設定読み込みモジュール
 YAML設定ファイルの読み込み、バリデーション、フォールバック処理を提供
 """
 
+import copy
+import hashlib
+import json
 import os
+import tempfile
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
-import yaml
+from typing import Dict, Any, Optional, Tuple, List, Collection, FrozenSet
 
 # 設定ファイルのデフォルトパス
 CONFIG_DIR = Path(__file__).parent.parent / "config"
@@ -15,6 +20,15 @@ SPECS_FILE = CONFIG_DIR / "omnisorter_specs.yaml"
 MATRIX_FILE = CONFIG_DIR / "container_model_matrix.yaml"
 APP_SETTINGS_FILE = CONFIG_DIR / "app_settings.yaml"
 
+# バリデーションで収集するエラー数の上限（これに達したら以降のチェックを打ち切る）
+DEFAULT_MAX_VALIDATION_ERRORS = 10
+
+# 解析済みYAMLのディスクキャッシュ（プロセス再起動時にYAML解析を省略する）
+CONFIG_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "omnisorter"
+
+# get_config_info のディレクトリ走査結果を使い回す秒数
+CONFIG_INFO_TTL_SECONDS = 5.0
+
 
 class ConfigLoadError(Exception):
     """設定読み込みエラー"""
@@ -26,10 +40,129 @@ class ConfigValidationError(Exception):
     pass
 
 
+def _get_file_key(file_path: Path) -> Tuple[int, int]:
+    """
+    ファイルの (更新時刻ns, サイズ) を取得する（キャッシュキー用）
+
+    更新時刻の分解能が粗いファイルシステムでも、サイズが変われば別キーになる。
+
+    Raises:
+        ConfigLoadError: ファイルが存在しない場合
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise ConfigLoadError(f"設定ファイルが見つかりません: {file_path}")
+    return stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=1)
+def _get_yaml_loader():
+    """
+    yaml モジュールとローダーを初回使用時に読み込む
+
+    デフォルト設定のみで動く経路では PyYAML を import しない。
+    libyaml があれば C 実装のローダーを使用（yaml.safe_load は純Python実装）。
+
+    Returns:
+        (yaml モジュール, ローダークラス) のタプル
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return yaml, loader
+
+
+def _get_disk_cache_prefix(path_str: str) -> str:
+    """ディスクキャッシュのファイル名接頭辞（同名ファイルの衝突を避けるためパスのハッシュを含める）"""
+    path_hash = hashlib.blake2b(path_str.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{Path(path_str).name}-{path_hash}-"
+
+
+def _get_disk_cache_path(path_str: str, file_key: Tuple[int, int]) -> Path:
+    """ディスクキャッシュのパス（更新時刻・サイズが変われば別ファイルになる）"""
+    mtime_ns, size = file_key
+    return CONFIG_CACHE_DIR / f"{_get_disk_cache_prefix(path_str)}{mtime_ns}-{size}.json"
+
+
+def _read_disk_cache(cache_path: Path) -> Optional[Any]:
+    """ディスクキャッシュを読み込む（存在しない・壊れている場合は None）"""
+    try:
+        with open(cache_path, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_disk_cache(path_str: str, cache_path: Path, data: Any) -> None:
+    """
+    解析結果をディスクキャッシュに書き込む
+
+    JSON で往復できないデータ（文字列以外のキー・日付など）は書き込まない。
+    一時ファイルに書いてから os.replace で置き換え、同じ設定ファイルの古いキャッシュは削除する。
+    書き込みに失敗してもエラーにはしない。
+    """
+    try:
+        payload = json.dumps(data, ensure_ascii=False)
+        if json.loads(payload) != data:
+            return
+    except (TypeError, ValueError):
+        return
+
+    try:
+        CONFIG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CONFIG_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+        prefix = _get_disk_cache_prefix(path_str)
+        for stale in CONFIG_CACHE_DIR.glob(f"{prefix}*.json"):
+            if stale != cache_path:
+                stale.unlink()
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path_str: str, file_key: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    YAMLファイルを解析する（パス・更新時刻・サイズが同じ間はキャッシュを返す）
+
+    プロセス内のキャッシュがない場合は、同じ更新時刻・サイズのディスクキャッシュを優先して使う。
+    """
+    cache_path = _get_disk_cache_path(path_str, file_key)
+    cached = _read_disk_cache(cache_path)
+    if cached is not None:
+        return cached
+
+    yaml, loader = _get_yaml_loader()
+    try:
+        # バイト列のまま渡し、UTF-8 のデコードはローダー側（libyaml）に任せる
+        with open(path_str, 'rb') as f:
+            data = yaml.load(f, Loader=loader)
+    except FileNotFoundError:
+        raise ConfigLoadError(f"設定ファイルが見つかりません: {path_str}")
+    except yaml.YAMLError as e:
+        raise ConfigLoadError(f"YAML解析エラー: {path_str} - {str(e)}")
+
+    _write_disk_cache(path_str, cache_path, data)
+    return data
+
+
 def _load_yaml_file(file_path: Path) -> Dict[str, Any]:
     """
     YAMLファイルを読み込む
 
+    ファイルが更新されるまでは解析結果をキャッシュから返す。
+    戻り値は共有されるため、読み取り専用として扱うこと。
+
     Args:
         file_path: YAMLファイルのパス
 
@@ -39,21 +172,50 @@ def _load_yaml_file(file_path: Path) -> Dict[str, Any]:
     Raises:
         ConfigLoadError: ファイル読み込みエラー
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        raise ConfigLoadError(f"設定ファイルが見つかりません: {file_path}")
-    except yaml.YAMLError as e:
-        raise ConfigLoadError(f"YAML解析エラー: {file_path} - {str(e)}")
-
-
-def _validate_omnisorter_specs(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    return _load_yaml_cached(str(file_path), _get_file_key(file_path))
+
+
+# バリデーション用スキーマ（フィールドの並びがエラーメッセージの出力順になる）
+_MISSING = object()
+_NUMBER = (int, float)
+
+# 機種スペック: (フィールド名, 種別, 引数)
+#   'nested': 引数は数値であるべきサブフィールド名のタプル
+#   'scalar': 引数は (許容する型, 範囲条件, 型エラー文言, 範囲エラー文言)
+_SPEC_SCHEMA = (
+    ('name', None, None),
+    ('dimensions', 'nested', ('L', 'W', 'H')),
+    ('maxProduct', 'nested', ('L', 'W', 'H', 'weight')),
+    ('processingCapacity', 'scalar',
+     (_NUMBER, lambda v: v > 0, "は数値である必要があります", "は正の数である必要があります")),
+    ('totalPorts', 'scalar',
+     (int, lambda v: v > 0, "は整数である必要があります", "は正の整数である必要があります")),
+    ('priority', 'scalar',
+     (int, lambda v: v >= 1, "は1以上の整数である必要があります", "は1以上の整数である必要があります")),
+)
+
+# 容器マトリクス: (フィールド名, 型)。int は0以上、bool は真偽値であること
+_MATRIX_SCHEMA = (
+    ('max_rows', int),
+    ('max_columns', int),
+    ('max_sides', int),
+    ('ports_per_block', int),
+    ('default_blocks', int),
+    ('recommended', bool),
+    ('supported', bool),
+)
+
+
+def _validate_omnisorter_specs(
+    data: Dict[str, Any],
+    max_errors: Optional[int] = DEFAULT_MAX_VALIDATION_ERRORS
+) -> Tuple[bool, List[str]]:
     """
     機種スペックデータのバリデーション
 
     Args:
         data: 読み込んだスペックデータ
+        max_errors: エラー数の上限（達した時点で打ち切る。None で全件チェック）
 
     Returns:
         (成功フラグ, エラーメッセージのリスト)
@@ -64,63 +226,58 @@ def _validate_omnisorter_specs(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
         errors.append("'models' キーが存在しません")
         return False, errors
 
-    required_fields = ['name', 'dimensions', 'maxProduct', 'processingCapacity', 'totalPorts', 'priority']
-    dimension_fields = ['L', 'W', 'H']
-    max_product_fields = ['L', 'W', 'H', 'weight']
+    _isinstance = isinstance
+    missing_mark = _MISSING
 
     for model_id, spec in data['models'].items():
-        prefix = f"機種 '{model_id}'"
-
-        # 必須フィールドチェック
-        for field in required_fields:
-            if field not in spec:
-                errors.append(f"{prefix}: 必須フィールド '{field}' がありません")
-
-        # dimensions チェック
-        if 'dimensions' in spec:
-            for dim in dimension_fields:
-                if dim not in spec['dimensions']:
-                    errors.append(f"{prefix}: dimensions.{dim} がありません")
-                elif not isinstance(spec['dimensions'][dim], (int, float)):
-                    errors.append(f"{prefix}: dimensions.{dim} は数値である必要があります")
-
-        # maxProduct チェック
-        if 'maxProduct' in spec:
-            for field in max_product_fields:
-                if field not in spec['maxProduct']:
-                    errors.append(f"{prefix}: maxProduct.{field} がありません")
-                elif not isinstance(spec['maxProduct'][field], (int, float)):
-                    errors.append(f"{prefix}: maxProduct.{field} は数値である必要があります")
-
-        # processingCapacity チェック
-        if 'processingCapacity' in spec:
-            if not isinstance(spec['processingCapacity'], (int, float)):
-                errors.append(f"{prefix}: processingCapacity は数値である必要があります")
-            elif spec['processingCapacity'] <= 0:
-                errors.append(f"{prefix}: processingCapacity は正の数である必要があります")
-
-        # totalPorts チェック
-        if 'totalPorts' in spec:
-            if not isinstance(spec['totalPorts'], int):
-                errors.append(f"{prefix}: totalPorts は整数である必要があります")
-            elif spec['totalPorts'] <= 0:
-                errors.append(f"{prefix}: totalPorts は正の整数である必要があります")
-
-        # priority チェック
-        if 'priority' in spec:
-            if not isinstance(spec['priority'], int) or spec['priority'] < 1:
-                errors.append(f"{prefix}: priority は1以上の整数である必要があります")
+        if max_errors is not None and len(errors) >= max_errors:
+            return False, errors
+
+        # 必須フィールドの欠落を先に、値の不正を後に出力する
+        missing = []
+        invalid = []
+
+        # スキーマを1回走査し、各フィールドは1回だけ取り出す
+        for field, kind, arg in _SPEC_SCHEMA:
+            value = spec.get(field, missing_mark)
+            if value is missing_mark:
+                missing.append(f"必須フィールド '{field}' がありません")
+            elif kind == 'nested':
+                if not _isinstance(value, dict):
+                    value = {}
+                for sub in arg:
+                    sub_value = value.get(sub, missing_mark)
+                    if sub_value is missing_mark:
+                        invalid.append(f"{field}.{sub} がありません")
+                    elif not _isinstance(sub_value, _NUMBER):
+                        invalid.append(f"{field}.{sub} は数値である必要があります")
+            elif kind == 'scalar':
+                types, in_range, type_msg, range_msg = arg
+                if not _isinstance(value, types):
+                    invalid.append(f"{field} {type_msg}")
+                elif not in_range(value):
+                    invalid.append(f"{field} {range_msg}")
+
+        # エラーがある場合のみ接頭辞を組み立てる
+        if missing or invalid:
+            prefix = f"機種 '{model_id}'"
+            errors.extend(f"{prefix}: {message}" for message in missing + invalid)
 
     return len(errors) == 0, errors
 
 
-def _validate_container_matrix(data: Dict[str, Any], model_ids: List[str]) -> Tuple[bool, List[str]]:
+def _validate_container_matrix(
+    data: Dict[str, Any],
+    model_ids: Collection[str],
+    max_errors: Optional[int] = DEFAULT_MAX_VALIDATION_ERRORS
+) -> Tuple[bool, List[str]]:
     """
     容器マトリクスデータのバリデーション
 
     Args:
         data: 読み込んだマトリクスデータ
-        model_ids: 有効な機種IDのリスト
+        model_ids: 有効な機種IDの集合（set 以外はここで frozenset に変換）
+        max_errors: エラー数の上限（達した時点で打ち切る。None で全件チェック）
 
     Returns:
         (成功フラグ, エラーメッセージのリスト)
@@ -131,36 +288,45 @@ def _validate_container_matrix(data: Dict[str, Any], model_ids: List[str]) -> Tu
         errors.append("'matrix' キーが存在しません")
         return False, errors
 
-    required_config_fields = [
-        'max_rows', 'max_columns', 'max_sides', 'ports_per_block',
-        'default_blocks', 'recommended', 'supported'
-    ]
+    # 機種IDの存在チェックを O(1) にする
+    if not isinstance(model_ids, (set, frozenset)):
+        model_ids = frozenset(model_ids)
+
+    _isinstance = isinstance
+    missing_mark = _MISSING
 
     for model_id, containers in data['matrix'].items():
+        if max_errors is not None and len(errors) >= max_errors:
+            return False, errors
+
         if model_id not in model_ids:
             errors.append(f"マトリクスの機種ID '{model_id}' がスペック定義に存在しません")
             continue
 
         for container_type, config in containers.items():
-            prefix = f"'{model_id}' - '{container_type}'"
-
-            for field in required_config_fields:
-                if field not in config:
-                    errors.append(f"{prefix}: 必須フィールド '{field}' がありません")
-
-            # 数値フィールドのチェック
-            numeric_fields = ['max_rows', 'max_columns', 'max_sides', 'ports_per_block', 'default_blocks']
-            for field in numeric_fields:
-                if field in config and not isinstance(config[field], int):
-                    errors.append(f"{prefix}: {field} は整数である必要があります")
-                elif field in config and config[field] < 0:
-                    errors.append(f"{prefix}: {field} は0以上である必要があります")
-
-            # boolフィールドのチェック
-            bool_fields = ['recommended', 'supported']
-            for field in bool_fields:
-                if field in config and not isinstance(config[field], bool):
-                    errors.append(f"{prefix}: {field} は真偽値である必要があります")
+            if max_errors is not None and len(errors) >= max_errors:
+                return False, errors
+
+            # 必須フィールドの欠落を先に、値の不正を後に出力する
+            missing = []
+            invalid = []
+
+            for field, field_type in _MATRIX_SCHEMA:
+                value = config.get(field, missing_mark)
+                if value is missing_mark:
+                    missing.append(f"必須フィールド '{field}' がありません")
+                elif field_type is bool:
+                    if not _isinstance(value, bool):
+                        invalid.append(f"{field} は真偽値である必要があります")
+                elif not _isinstance(value, int):
+                    invalid.append(f"{field} は整数である必要があります")
+                elif value < 0:
+                    invalid.append(f"{field} は0以上である必要があります")
+
+            # エラーがある場合のみ接頭辞を組み立てる
+            if missing or invalid:
+                prefix = f"'{model_id}' - '{container_type}'"
+                errors.extend(f"{prefix}: {message}" for message in missing + invalid)
 
     return len(errors) == 0, errors
 
@@ -182,8 +348,13 @@ def load_omnisorter_specs(
         ConfigValidationError: バリデーションエラー
     """
     path = file_path or SPECS_FILE
+    return _load_specs_cached(str(path), _get_file_key(path))
 
-    data = _load_yaml_file(path)
+
+@lru_cache(maxsize=8)
+def _load_specs_cached(path_str: str, file_key: Tuple[int, int]) -> Dict[str, Any]:
+    """機種スペックを読み込み・検証する（ファイル更新までキャッシュ）"""
+    data = _load_yaml_file(Path(path_str))
     valid, errors = _validate_omnisorter_specs(data)
 
     if not valid:
@@ -213,13 +384,18 @@ def load_container_model_matrix(
     """
     path = file_path or MATRIX_FILE
 
-    data = _load_yaml_file(path)
-
     # バリデーション用の機種IDリストを取得
     if specs is None:
         specs = load_omnisorter_specs()
-    model_ids = list(specs.keys())
+    model_ids = frozenset(specs.keys())
 
+    return _load_matrix_cached(str(path), _get_file_key(path), model_ids)
+
+
+@lru_cache(maxsize=8)
+def _load_matrix_cached(path_str: str, file_key: Tuple[int, int], model_ids: FrozenSet[str]) -> Dict[str, Any]:
+    """容器マトリクスを読み込み・検証する（ファイル更新または機種ID変更までキャッシュ）"""
+    data = _load_yaml_file(Path(path_str))
     valid, errors = _validate_container_matrix(data, model_ids)
 
     if not valid:
@@ -231,20 +407,89 @@ def load_container_model_matrix(
 
 def reload_all_configs() -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
-    全ての設定を再読み込みする
+    全ての設定を再読み込みする（キャッシュを破棄してファイルから読み直す）
 
     Returns:
         (機種スペック, 容器マトリクス) のタプル
     """
+    clear_config_cache()
+
     specs = load_omnisorter_specs()
     matrix = load_container_model_matrix(specs=specs)
     return specs, matrix
 
 
+# アプリケーション設定のデフォルト値（ファイルがない場合のフォールバック）
+# 呼び出し側には常にコピーを返すため、この辞書自体は変更しないこと
+_APP_SETTINGS_DEFAULTS = {
+    'calculation': {
+        'target_utilization': 0.95,
+        'target_rotation': 5,  # 目標回転数（回転/時）
+        'max_units': 2  # 台数上限
+    },
+    'scoring': {
+        'model_priority': {'S': 100, 'M': 50, 'L': 25, 'mini_small': 150, 'mini_large': 10},
+        'mini_threshold_pcs': 3000,
+        'container_recommended_bonus': 20,
+        'utilization': {
+            'optimal_min': 60, 'optimal_max': 85, 'optimal_bonus': 15,
+            'high_max': 95, 'high_bonus': 10, 'overload_penalty': -10
+        },
+        'cost_penalty': {'units_penalty': 30, 'ports_penalty': 0.1, 'ports_baseline': 40}
+    },
+    'ui_defaults': {
+        'daily_orders': 1000,
+        'pieces_per_order': 2.0,
+        'working_hours': 8.0,
+        'product_length': 300,
+        'product_width': 200,
+        'product_height': 150,
+        'product_weight': 1.5,
+        'peak_ratio_options': [1.0, 1.2, 1.5, 2.0, 2.5, 3.0]
+    },
+    'display': {
+        'utilization_thresholds': {'warning': 85, 'danger': 95},
+        'target_utilization_display': '60-85%',
+        'batch_mode_max_pcs': 10
+    },
+    'debug': False  # 計算デバッグ情報の生成
+}
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    辞書を再帰的にマージする（override の値を優先）
+
+    base をまとめて複製し、ネストした辞書は (マージ先, マージ元) のスタックで
+    反復的に上書きする。
+
+    Args:
+        base: ベースとなる辞書（変更されない）
+        override: 上書きする辞書
+
+    Returns:
+        マージ結果の新しい辞書
+    """
+    result = copy.deepcopy(base)
+    stack = [(result, override)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                stack.append((current, value))
+            else:
+                dst[key] = value
+    return result
+
+
 def load_app_settings(file_path: Optional[Path] = None) -> Dict[str, Any]:
     """
     アプリケーション設定を読み込む
 
+    ファイルが更新されるまではYAMLの解析・マージを省略し、キャッシュ済みの設定を複製して返す。
+    戻り値は呼び出しごとに新しい辞書のため、変更してもキャッシュには影響しない。
+
     Args:
         file_path: 設定ファイルのパス (省略時はデフォルト)
 
@@ -252,58 +497,60 @@ def load_app_settings(file_path: Optional[Path] = None) -> Dict[str, Any]:
         アプリケーション設定辞書
     """
     path = file_path or APP_SETTINGS_FILE
+    try:
+        file_key = _get_file_key(path)
+    except ConfigLoadError:
+        file_key = None
+    return copy.deepcopy(_load_app_settings_cached(str(path), file_key))
 
-    # デフォルト設定（ファイルがない場合のフォールバック）
-    defaults = {
-        'calculation': {
-            'target_utilization': 0.95,
-            'target_rotation': 5,  # 目標回転数（回転/時）
-            'max_units': 2  # 台数上限
-        },
-        'scoring': {
-            'model_priority': {'S': 100, 'M': 50, 'L': 25, 'mini_small': 150, 'mini_large': 10},
-            'mini_threshold_pcs': 3000,
-            'container_recommended_bonus': 20,
-            'utilization': {
-                'optimal_min': 60, 'optimal_max': 85, 'optimal_bonus': 15,
-                'high_max': 95, 'high_bonus': 10, 'overload_penalty': -10
-            },
-            'cost_penalty': {'units_penalty': 30, 'ports_penalty': 0.1, 'ports_baseline': 40}
-        },
-        'ui_defaults': {
-            'daily_orders': 1000,
-            'pieces_per_order': 2.0,
-            'working_hours': 8.0,
-            'product_length': 300,
-            'product_width': 200,
-            'product_height': 150,
-            'product_weight': 1.5,
-            'peak_ratio_options': [1.0, 1.2, 1.5, 2.0, 2.5, 3.0]
-        },
-        'display': {
-            'utilization_thresholds': {'warning': 85, 'danger': 95},
-            'target_utilization_display': '60-85%',
-            'batch_mode_max_pcs': 10
-        }
-    }
 
-    if not path.exists():
-        return defaults
+@lru_cache(maxsize=4)
+def _load_app_settings_cached(path_str: str, file_key: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    アプリケーション設定を読み込み・マージする（ファイル更新までキャッシュ、ファイルがなければ None キー）
+
+    戻り値はキャッシュ内で共有されるため、外部に渡す前に load_app_settings で複製する。
+    """
+    if file_key is None:
+        return _APP_SETTINGS_DEFAULTS
 
     try:
-        data = _load_yaml_file(path)
+        data = _load_yaml_file(Path(path_str))
         # デフォルト値とマージ（ファイルの値を優先）
-        def deep_merge(base, override):
-            result = base.copy()
-            for key, value in override.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = deep_merge(result[key], value)
-                else:
-                    result[key] = value
-            return result
-        return deep_merge(defaults, data)
+        return _deep_merge(_APP_SETTINGS_DEFAULTS, data)
     except ConfigLoadError:
-        return defaults
+        return _APP_SETTINGS_DEFAULTS
+
+
+def clear_config_cache() -> None:
+    """設定ファイルの読み込みキャッシュを全て破棄する（設定ファイルを編集した後に使用）"""
+    _load_yaml_cached.cache_clear()
+    _load_specs_cached.cache_clear()
+    _load_matrix_cached.cache_clear()
+    _load_app_settings_cached.cache_clear()
+    _scan_config_dir.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _scan_config_dir(ttl_bucket: int) -> Dict[str, Tuple[int, int]]:
+    """
+    設定ディレクトリを1回の scandir で走査する
+
+    ttl_bucket が同じ間（CONFIG_INFO_TTL_SECONDS ごと）は前回の結果を返す。
+
+    Returns:
+        {ファイル名: (更新時刻ns, サイズ)} の辞書（ディレクトリがない場合は空）
+    """
+    entries = {}
+    try:
+        with os.scandir(CONFIG_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return entries
 
 
 def get_config_info() -> Dict[str, Any]:
@@ -313,12 +560,13 @@ def get_config_info() -> Dict[str, Any]:
     Returns:
         設定ファイルの情報辞書
     """
+    entries = _scan_config_dir(int(time.monotonic() // CONFIG_INFO_TTL_SECONDS))
     return {
         'config_dir': str(CONFIG_DIR),
         'specs_file': str(SPECS_FILE),
-        'specs_exists': SPECS_FILE.exists(),
+        'specs_exists': SPECS_FILE.name in entries,
         'matrix_file': str(MATRIX_FILE),
-        'matrix_exists': MATRIX_FILE.exists(),
+        'matrix_exists': MATRIX_FILE.name in entries,
         'app_settings_file': str(APP_SETTINGS_FILE),
-        'app_settings_exists': APP_SETTINGS_FILE.exists()
+        'app_settings_exists': APP_SETTINGS_FILE.name in entries
     }
@@ -5,10 +5,156 @@ OmniSorter製品に関する問い合わせを受け付けるフォーム
 """
 
 import streamlit as st
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import atexit
+import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from string import Template
+
+_log = logging.getLogger(__name__)
+
+# メールアドレスの形式（末尾改行を許容しないよう $ ではなく \Z で終端を判定）
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+# 確認メール本文（問い合わせ者向け）
+_CONFIRM_BODY_TMPL = Template("""$name 様
+
+このたびはOmniSorterに関するお問い合わせをいただき、
+誠にありがとうございます。
+
+以下の内容でお問い合わせを承りました。
+担当者より3営業日以内にご連絡させていただきます。
+
+━━━━━━━━━━━━━━━━━━━━━━
+【お問い合わせ内容】
+━━━━━━━━━━━━━━━━━━━━━━
+会社名: $company
+お名前: $name
+問い合わせ種別: $inquiry_type
+
+■ ご記入内容
+$message
+$calculation_section
+━━━━━━━━━━━━━━━━━━━━━━
+
+ご不明な点がございましたら、お気軽にご連絡ください。
+
+━━━━━━━━━━━━━━━━━━━━━━
+署名
+━━━━━━━━━━━━━━━━━━━━━━
+
+※このメールは自動送信されています。
+※心当たりのない場合は、お手数ですが本メールを破棄してください。
+""")
+
+# 問い合わせメール本文（社内向け）
+_INTERNAL_BODY_TMPL = Template("""
+新規お問い合わせがありました
+
+━━━━━━━━━━━━━━━━━━━━━━
+【会社名】
+$company
+
+【お名前】
+$name
+
+【メールアドレス】
+$email
+
+【電話番号】
+$phone
+
+【問い合わせ種別】
+$inquiry_type
+$sales_rep_section
+【お問い合わせ内容】
+$message
+━━━━━━━━━━━━━━━━━━━━━━
+$calculation_section
+
+※このメールはOmniSorter簡易試算ツールから自動送信されました
+""")
+
+# 確認メールをバックグラウンドで送信するスレッドプール（送信中の待ち時間を画面に持ち込まない）
+_MAIL_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='mail')
+# プロセス終了時は送信待ちの確認メールを送り切ってから終了する
+atexit.register(_MAIL_POOL.shutdown, wait=True)
+
+
+@lru_cache(maxsize=1)
+def _get_smtp_modules():
+    """
+    メール送信用モジュールを初回送信時に読み込む
+
+    フォームを表示するだけなら smtplib / email を import しない。
+
+    Returns:
+        (smtplib, EmailMessage) のタプル
+    """
+    import smtplib
+    from email.message import EmailMessage
+    return smtplib, EmailMessage
+
+
+@lru_cache(maxsize=1)
+def _get_smtp_config():
+    """
+    Streamlit Secrets の SMTP 設定をプロセス内で一度だけ読み込む
+
+    port は整数に変換済み。secrets.toml がない・[smtp] が空の場合は None。
+    secrets.toml を変更した場合はアプリの再起動が必要。
+
+    Raises:
+        KeyError: port が設定されていない場合
+    """
+    try:
+        smtp_section = st.secrets.get("smtp", {})
+    except FileNotFoundError:
+        return None
+    if not smtp_section:
+        return None
+
+    smtp_config = dict(smtp_section)
+    smtp_config['port'] = int(smtp_config['port'])
+    return smtp_config
+
+
+@contextmanager
+def _with_smtp(smtp_config: dict):
+    """
+    SMTPサーバーに接続し、STARTTLS・ログイン済みの接続を返す
+
+    複数のメールを1回の接続（TCP/TLS ハンドシェイク・認証）でまとめて送信するために使う。
+
+    Args:
+        smtp_config: SMTP設定（_get_smtp_config の戻り値）
+    """
+    smtplib = _get_smtp_modules()[0]
+    with smtplib.SMTP(smtp_config['host'], smtp_config['port']) as server:
+        server.starttls()
+        server.login(smtp_config['username'], smtp_config['password'])
+        yield server
+
+
+def _build_mime(from_addr: str, to_addr: str, subject: str, body: str):
+    """
+    テキスト本文のメールメッセージを構築
+
+    Args:
+        from_addr: 送信元アドレス
+        to_addr: 送信先アドレス
+        subject: 件名
+        body: 本文（UTF-8 のプレーンテキスト）
+    """
+    EmailMessage = _get_smtp_modules()[1]
+    msg = EmailMessage()
+    msg['From'] = from_addr
+    msg['To'] = to_addr
+    msg['Subject'] = subject
+    msg.set_content(body, subtype='plain', charset='utf-8')
+    return msg
 
 
 def validate_email(email: str) -> bool:
@@ -21,8 +167,7 @@ def validate_email(email: str) -> bool:
     Returns:
         bool: 有効な形式の場合True
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 def format_number(value, default='N/A'):
@@ -49,45 +194,50 @@ def format_calculation_data(params: dict, result: dict) -> str:
     if not params or not result:
         return ""
 
-    lines = []
-    lines.append("\n━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append("【試算入力条件】")
-    lines.append(f"  日次出荷件数: {format_number(params.get('daily_orders'))} 件/日")
-    lines.append(f"  平均ピース数/件: {params.get('pieces_per_order', 'N/A')} pcs")
-    lines.append(f"  作業時間: {params.get('working_hours', 'N/A')} 時間/日")
-    lines.append(f"  ピーク倍率: {params.get('peak_ratio', 'N/A')} 倍")
-    lines.append(f"  商品サイズ(L×W×H): {params.get('product_length', 'N/A')} × {params.get('product_width', 'N/A')} × {params.get('product_height', 'N/A')} mm")
-    lines.append(f"  商品重量: {params.get('product_weight', 'N/A')} kg")
-    lines.append(f"  容器タイプ: {params.get('container_type', 'N/A')}")
-
-    lines.append("\n━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append("【試算結果】")
+    separator = "━━━━━━━━━━━━━━━━━━━━━━"
 
     # 推奨機種情報
+    model_section = ""
     if 'selected_model' in result and result['selected_model']:
-        model = result['selected_model']
-        spec = model.get('spec', {})
-        lines.append(f"  推奨機種: {spec.get('name', 'N/A')}")
-        lines.append(f"  必要台数: {result.get('recommended_units', 'N/A')} 台")
-        lines.append(f"  ブロック数: {result.get('num_blocks', 'N/A')} ブロック/台")
-        lines.append(f"  間口数: {result.get('num_intervals', 'N/A')} 間口/台")
-        lines.append(f"  処理能力: {format_number(result.get('actual_capacity'))} pcs/時")
-
-    # 日次処理量
-    if 'daily_pieces' in result:
-        lines.append(f"  日次処理量: {format_number(result.get('daily_pieces'))} pcs/日")
-
-    # 必要処理能力
-    if 'required_capacity_per_hour' in result:
-        lines.append(f"  必要処理能力: {format_number(result.get('required_capacity_per_hour'))} pcs/時")
-
-    # 稼働率
-    if 'capacity_utilization' in result:
-        lines.append(f"  稼働率: {result.get('capacity_utilization', 0):.1f}%")
-
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━")
+        spec = result['selected_model'].get('spec', {})
+        model_section = (
+            f"  推奨機種: {spec.get('name', 'N/A')}\n"
+            f"  必要台数: {result.get('recommended_units', 'N/A')} 台\n"
+            f"  ブロック数: {result.get('num_blocks', 'N/A')} ブロック/台\n"
+            f"  間口数: {result.get('num_intervals', 'N/A')} 間口/台\n"
+            f"  処理能力: {format_number(result.get('actual_capacity'))} pcs/時\n"
+        )
 
-    return "\n".join(lines)
+    # 日次処理量・必要処理能力・稼働率（結果に含まれる場合のみ）
+    daily_section = (
+        f"  日次処理量: {format_number(result.get('daily_pieces'))} pcs/日\n"
+        if 'daily_pieces' in result else ""
+    )
+    required_section = (
+        f"  必要処理能力: {format_number(result.get('required_capacity_per_hour'))} pcs/時\n"
+        if 'required_capacity_per_hour' in result else ""
+    )
+    utilization_section = (
+        f"  稼働率: {result.get('capacity_utilization', 0):.1f}%\n"
+        if 'capacity_utilization' in result else ""
+    )
+
+    return (
+        f"\n{separator}\n"
+        f"【試算入力条件】\n"
+        f"  日次出荷件数: {format_number(params.get('daily_orders'))} 件/日\n"
+        f"  平均ピース数/件: {params.get('pieces_per_order', 'N/A')} pcs\n"
+        f"  作業時間: {params.get('working_hours', 'N/A')} 時間/日\n"
+        f"  ピーク倍率: {params.get('peak_ratio', 'N/A')} 倍\n"
+        f"  商品サイズ(L×W×H): {params.get('product_length', 'N/A')} × "
+        f"{params.get('product_width', 'N/A')} × {params.get('product_height', 'N/A')} mm\n"
+        f"  商品重量: {params.get('product_weight', 'N/A')} kg\n"
+        f"  容器タイプ: {params.get('container_type', 'N/A')}\n"
+        f"\n{separator}\n"
+        f"【試算結果】\n"
+        f"{model_section}{daily_section}{required_section}{utilization_section}"
+        f"{separator}"
+    )
 
 
 def send_confirmation_email(name: str, email: str, company: str,
@@ -109,59 +259,38 @@ def send_confirmation_email(name: str, email: str, company: str,
         bool: 送信成功した場合True
     """
     try:
-        smtp_config = st.secrets.get("smtp", {})
-        if not smtp_config:
+        smtp_config = _get_smtp_config()
+        if smtp_config is None:
+            _log.warning("Confirmation email skipped: SMTP settings not found")
             return False
 
         # 計算データのフォーマット
         calculation_section = format_calculation_data(params, result)
 
         # 確認メール本文
-        body = f"""{name} 様
-
-このたびはOmniSorterに関するお問い合わせをいただき、
-誠にありがとうございます。
-
-以下の内容でお問い合わせを承りました。
-担当者より3営業日以内にご連絡させていただきます。
-
-━━━━━━━━━━━━━━━━━━━━━━
-【お問い合わせ内容】
-━━━━━━━━━━━━━━━━━━━━━━
-会社名: {company}
-お名前: {name}
-問い合わせ種別: {inquiry_type}
-
-■ ご記入内容
-{message}
-{calculation_section}
-━━━━━━━━━━━━━━━━━━━━━━
-
-ご不明な点がございましたら、お気軽にご連絡ください。
-
-━━━━━━━━━━━━━━━━━━━━━━
-署名
-━━━━━━━━━━━━━━━━━━━━━━
-
-※このメールは自動送信されています。
-※心当たりのない場合は、お手数ですが本メールを破棄してください。
-"""
+        body = _CONFIRM_BODY_TMPL.substitute(
+            name=name,
+            company=company,
+            inquiry_type=inquiry_type,
+            message=message,
+            calculation_section=calculation_section
+        )
 
-        msg = MIMEMultipart()
-        msg['From'] = smtp_config.get('from_email')
-        msg['To'] = email
-        msg['Subject'] = f"【OmniSorter】お問い合わせありがとうございます（{inquiry_type}）"
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        msg = _build_mime(
+            smtp_config.get('from_email'),
+            email,
+            f"【OmniSorter】お問い合わせありがとうございます（{inquiry_type}）",
+            body
+        )
 
-        with smtplib.SMTP(smtp_config['host'], int(smtp_config['port'])) as server:
-            server.starttls()
-            server.login(smtp_config['username'], smtp_config['password'])
+        with _with_smtp(smtp_config) as server:
             server.send_message(msg)
 
         return True
 
     except Exception:
-        # 確認メール送信失敗は致命的エラーではないため、静かに失敗
+        # 確認メール送信失敗は致命的エラーではないため、画面には出さずログに残す
+        _log.exception("Confirmation email failed")
         return False
 
 
@@ -187,10 +316,10 @@ def send_inquiry_email(company: str, name: str, email: str, phone: str,
         bool: 送信成功した場合True
     """
     try:
-        # Streamlit Secretsから設定を取得
-        smtp_config = st.secrets.get("smtp", {})
+        # Streamlit Secretsから設定を取得（プロセス内でキャッシュ）
+        smtp_config = _get_smtp_config()
 
-        if not smtp_config:
+        if smtp_config is None:
             st.warning("⚠️ メール設定が見つかりません。管理者にお問い合わせください。")
             return False
 
@@ -201,48 +330,34 @@ def send_inquiry_email(company: str, name: str, email: str, phone: str,
         sales_rep_section = f"\n【ご連絡先担当者】\n{sales_rep}\n" if sales_rep else ""
 
         # メール本文を作成（社内向け）
-        body = f"""
-新規お問い合わせがありました
-
-━━━━━━━━━━━━━━━━━━━━━━
-【会社名】
-{company}
-
-【お名前】
-{name}
-
-【メールアドレス】
-{email}
-
-【電話番号】
-{phone or '未入力'}
-
-【問い合わせ種別】
-{inquiry_type}
-{sales_rep_section}
-【お問い合わせ内容】
-{message}
-━━━━━━━━━━━━━━━━━━━━━━
-{calculation_section}
-
-※このメールはOmniSorter簡易試算ツールから自動送信されました
-"""
+        body = _INTERNAL_BODY_TMPL.substitute(
+            company=company,
+            name=name,
+            email=email,
+            phone=phone or '未入力',
+            inquiry_type=inquiry_type,
+            sales_rep_section=sales_rep_section,
+            message=message,
+            calculation_section=calculation_section
+        )
 
         # メールメッセージを構築
-        msg = MIMEMultipart()
-        msg['From'] = smtp_config.get('from_email', 'noreply@bridgetown-eng.co.jp')
-        msg['To'] = smtp_config.get('to_email', 'sales@bridgetown-eng.co.jp')
-        msg['Subject'] = f"[OmniSorter] {inquiry_type} - {company}"
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        msg = _build_mime(
+            smtp_config.get('from_email', 'noreply@bridgetown-eng.co.jp'),
+            smtp_config.get('to_email', 'sales@bridgetown-eng.co.jp'),
+            f"[OmniSorter] {inquiry_type} - {company}",
+            body
+        )
 
         # SMTP経由で送信（社内向け）
-        with smtplib.SMTP(smtp_config['host'], int(smtp_config['port'])) as server:
-            server.starttls()
-            server.login(smtp_config['username'], smtp_config['password'])
+        # 失敗を画面に表示するため、社内向けは送信完了まで待つ
+        with _with_smtp(smtp_config) as server:
             server.send_message(msg)
 
-        # 問い合わせ者への確認メールを送信
-        send_confirmation_email(
+        # 問い合わせ者への確認メールはバックグラウンドで別接続から送信（完了を待たずに戻る）
+        # 失敗は send_confirmation_email 内でログに記録される
+        _MAIL_POOL.submit(
+            send_confirmation_email,
             name=name,
             email=email,
             company=company,
@@ -262,10 +377,14 @@ def send_inquiry_email(company: str, name: str, email: str, phone: str,
         return False
 
 
+@st.fragment
 def render_contact_form(params: dict = None, result: dict = None):
     """
     問い合わせフォームを表示
 
+    フラグメントとして実行するため、送信時はフォーム部分のみ再実行され
+    試算結果の表示は再描画されない。
+
     Args:
         params: 試算入力パラメータ（オプション）
         result: 試算結果（オプション）
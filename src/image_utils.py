@@ -0,0 +1,150 @@
+"""
+画像アセットのBase64データURI変換
+
+画像を <img src="data:..."> で埋め込むためのデータURIを生成する。
+事前に `python -m src.image_utils` で `.b64` サイドカーを生成しておくと、
+実行時のエンコードを省略できる。
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+# pybase64 があれば SIMD 実装を使用（なければ標準ライブラリ）
+try:
+    import pybase64 as base64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    import base64
+    PYBASE64_AVAILABLE = False
+
+# 拡張子 → MIME タイプ
+MIME_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+# サイドカーファイルの拡張子（例: OmniSorter.jpg.b64）
+SIDECAR_SUFFIX = '.b64'
+
+# エンコード時の読み込み単位（3の倍数にしてチャンク途中でパディングが入らないようにする）
+ENCODE_CHUNK_SIZE = 48 * 1024
+
+
+def get_mime_type(image_path: Path) -> str:
+    """拡張子から MIME タイプを判定（不明な場合は image/png）"""
+    return MIME_TYPES.get(image_path.suffix.lower(), 'image/png')
+
+
+def get_sidecar_path(image_path: Path) -> Path:
+    """画像に対応するサイドカーファイルのパス"""
+    return image_path.with_name(image_path.name + SIDECAR_SUFFIX)
+
+
+def encode_image_data_uri(image_path: Path) -> str:
+    """
+    画像をBase64エンコードしてデータURIを返す
+
+    Args:
+        image_path: 画像ファイルのパス
+
+    Returns:
+        "data:<mime>;base64,<payload>" 形式の文字列
+    """
+    # ファイル全体を読み込まず、固定サイズずつエンコードして連結する
+    encoded = bytearray()
+    with open(image_path, "rb") as f:
+        while chunk := f.read(ENCODE_CHUNK_SIZE):
+            encoded += base64.b64encode(chunk)
+    return f"data:{get_mime_type(image_path)};base64,{encoded.decode('ascii')}"
+
+
+def load_image_data_uri(image_path: Path) -> Optional[str]:
+    """
+    画像のデータURIを取得
+
+    画像より新しいサイドカーがあればそれを読み込み、なければエンコードする。
+
+    Args:
+        image_path: 画像ファイルのパス
+
+    Returns:
+        データURI（画像が存在しない場合は None）
+    """
+    try:
+        image_mtime = image_path.stat().st_mtime
+    except OSError:
+        return None
+
+    sidecar_path = get_sidecar_path(image_path)
+    try:
+        if sidecar_path.stat().st_mtime >= image_mtime:
+            return sidecar_path.read_text(encoding='ascii').strip()
+    except OSError:
+        pass
+
+    return encode_image_data_uri(image_path)
+
+
+def build_asset_index(directory: Path) -> Dict[str, str]:
+    """
+    ディレクトリ内の画像を一度だけ走査し、ファイル名 → データURI の辞書を作成
+
+    Args:
+        directory: 画像ディレクトリ
+
+    Returns:
+        {ファイル名: データURI} の辞書（ディレクトリがない場合は空）
+    """
+    index = {}
+    try:
+        entries = sorted(directory.iterdir())
+    except OSError:
+        return index
+
+    for image_path in entries:
+        if image_path.suffix.lower() not in MIME_TYPES:
+            continue
+        data_uri = load_image_data_uri(image_path)
+        if data_uri:
+            index[image_path.name] = data_uri
+    return index
+
+
+@lru_cache(maxsize=8)
+def get_asset_index(directory: Path) -> Dict[str, str]:
+    """
+    ディレクトリごとのアセットインデックスをプロセス内で共有する
+
+    初回のみ build_asset_index で走査し、以降は同じ辞書を返す（読み取り専用として扱うこと）。
+    """
+    return build_asset_index(directory)
+
+
+def write_sidecars(directory: Path) -> list:
+    """
+    ディレクトリ内の画像ごとにサイドカーファイルを生成
+
+    Args:
+        directory: 画像ディレクトリ
+
+    Returns:
+        生成したサイドカーファイルのパスのリスト
+    """
+    written = []
+    for image_path in sorted(directory.iterdir()):
+        if image_path.suffix.lower() not in MIME_TYPES:
+            continue
+        sidecar_path = get_sidecar_path(image_path)
+        sidecar_path.write_text(encode_image_data_uri(image_path), encoding='ascii')
+        written.append(sidecar_path)
+    return written
+
+
+if __name__ == "__main__":
+    assets_dir = Path(__file__).parent.parent / "assets" / "images"
+    for path in write_sidecars(assets_dir):
+        print(f"✅ {path}")
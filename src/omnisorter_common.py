@@ -1,5 +1,39 @@
 """OmniSorter関連の共通関数・定数を定義（修正版）"""
-from typing import Dict
+import collections
+import copy
+import logging
+import time
+import traceback
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Tuple
+
+# Streamlit がない環境（計算ロジックのみ利用する場合など）では Session State を使わない
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+_log = logging.getLogger(__name__)
+
+# 直近のエラー（管理画面での確認用。件数上限付きでメモリを一定に保つ）
+# 例外オブジェクトはトレースバック経由で失敗時のフレームを保持するため、文字列化して記録する
+_error_ring = collections.deque(maxlen=256)
+
+
+class SimulationParams(NamedTuple):
+    """シミュレーション入力パラメータ（不変・ハッシュ可能）"""
+    company_name: str
+    industry: str
+    business_type: str
+    daily_orders: int
+    pieces_per_order: float
+    working_hours: float
+    product_length: int
+    product_width: int
+    product_height: int
+    product_weight: float
+    container_type: str
+    peak_ratio: float
 
 
 def get_omnisorter_specs() -> Dict:
@@ -43,109 +77,159 @@ def get_app_settings() -> Dict:
     return load_app_settings()
 
 
+def clear_config_cache() -> None:
+    """
+    設定ローダーの読み込みキャッシュと容器構成インデックスを破棄する
+
+    破棄するのはこのモジュールと config_loader のキャッシュのみ。
+    app.py が st.cache_resource / st.cache_data で保持している設定は
+    app.reload_configs() で破棄する。
+    """
+    global _container_index_cache
+    from src.config_loader import clear_config_cache as _clear_loader_cache
+    _clear_loader_cache()
+    _container_index_cache = (None, None)
+
+
 def safe_get_session_value(key, default_value):
-    """セッション状態から値を安全に取得"""
-    try:
-        import streamlit as st
-        if key not in st.session_state:
-            st.session_state[key] = default_value
-        return st.session_state[key]
-    except:
+    """セッション状態から値を安全に取得（未設定ならデフォルト値を設定して返す）"""
+    if st is None:
         return default_value
+    return st.session_state.setdefault(key, default_value)
 
 def safe_set_session_value(key, value):
     """セッション状態に値を安全に設定"""
-    try:
-        import streamlit as st
-        st.session_state[key] = value
-        return True
-    except:
+    if st is None:
         return False
+    st.session_state[key] = value
+    return True
+
+# マトリクス未定義の組み合わせに返すフォールバック構成（共有のため読み取り専用として扱うこと）
+_FALLBACK_CONTAINER_CONFIG = {
+    'max_rows': 4, 'max_columns': 4, 'max_sides': 2,
+    'ports_per_block': 32, 'default_blocks': 3,
+    'recommended': False, 'supported': True,
+    'note': 'デフォルト構成（要確認）',
+    'configurable': True
+}
+
+# 直近に展開したマトリクスとそのインデックス（同じマトリクスなら再展開しない）
+_container_index_cache = (None, None)
+
+
+def _resolve_container_config(config):
+    """マトリクスの構成を参照用に解決する（非対応の場合は構成値を0にした辞書）"""
+    # 非対応の場合は明確にエラー情報を返す
+    if not config.get('supported', True):
+        return {
+            'max_rows': 0, 'max_columns': 0, 'max_sides': 0,
+            'ports_per_block': 0, 'default_blocks': 0,
+            'recommended': False, 'supported': False,
+            'note': config.get('note', '対応不可'),
+            'configurable': config.get('configurable', False)
+        }
+    return config
+
+
+def get_container_config_index(matrix):
+    """
+    容器×機種マトリクスを (機種ID, 容器タイプ) をキーとするフラットな辞書に展開する
+
+    同じマトリクスオブジェクトに対しては前回の展開結果を返す。
+    戻り値は共有されるため、読み取り専用として扱うこと。
+    """
+    global _container_index_cache
+    cached_matrix, index = _container_index_cache
+    if cached_matrix is not matrix:
+        index = {
+            (model_id, container_type): _resolve_container_config(config)
+            for model_id, containers in matrix.items()
+            for container_type, config in containers.items()
+        }
+        _container_index_cache = (matrix, index)
+    return index
+
 
 def get_container_model_config(model_id, container_type, matrix=None):
     """指定された機種と容器タイプの構成情報を取得（安全版）"""
     if matrix is None:
-        # 設定から取得を試行
+        # 設定から取得を試行（セッションに未設定なら初回参照時に読み込む）
         matrix = safe_get_session_value('container_model_matrix', None)
         if matrix is None:
             matrix = get_container_matrix()
-    
-    if model_id in matrix and container_type in matrix[model_id]:
-        config = matrix[model_id][container_type]
-        
-        # 非対応の場合は明確にエラー情報を返す
-        if not config.get('supported', True):
-            return {
-                'max_rows': 0, 'max_columns': 0, 'max_sides': 0,
-                'ports_per_block': 0, 'default_blocks': 0,
-                'recommended': False, 'supported': False,
-                'note': config.get('note', '対応不可'),
-                'configurable': config.get('configurable', False)
-            }
-        
-        return config
-    
-    # フォールバック
-    return {
-        'max_rows': 4, 'max_columns': 4, 'max_sides': 2,
-        'ports_per_block': 32, 'default_blocks': 3,
-        'recommended': False, 'supported': True,
-        'note': 'デフォルト構成（要確認）',
-        'configurable': True
-    }
+
+    # マトリクスにない組み合わせはフォールバック
+    return get_container_config_index(matrix).get((model_id, container_type), _FALLBACK_CONTAINER_CONFIG)
+
+# Session State のデフォルト値（プロセス内で一度だけ構築）
+# list / dict の値はセッション間で共有しないよう、設定時にコピーする
+_SESSION_DEFAULTS = MappingProxyType({
+    # アプリ全体の状態
+    'debug_logs': [],
+    'analysis_count': 0,
+    'admin_logged_in': False,
+    'current_page': '📊 データ分析',
+    'show_sidebar': True,
+
+    # OmniSorter 固有の状態
+    'daily_orders': 100,
+    'pieces_per_order': 2.5,
+    'daily_volume': 250,
+    'product_length': 300,
+    'product_width': 250,
+    'product_height': 150,
+    'product_weight': 1000,
+    'required_ports': 80,
+    'data_source': '手動入力',
+    'has_detailed_analysis': False,
+    'peak_ratio': 1.0,
+    'working_hours': 8.0,
+
+    # 計算結果の保存
+    'calculation_results': None,
+    'last_analysis_result': None,
+    'analysis_data_available': False,
+
+    # 設定関連
+    'container_model_matrix': None,
+    'omnisorter_specs': None,
+
+    # 管理者関連
+    'admin_user': '',
+    'admin_page': ''
+})
+
+_SESSION_INITIALIZED_KEY = '_session_defaults_initialized'
+
 
 def initialize_session_state_safely():
     """Session Stateを安全に初期化（修正版）"""
+    if st is None:
+        return
+
     try:
-        import streamlit as st
-        
-        defaults = {
-            # アプリ全体の状態
-            'debug_logs': [],
-            'analysis_count': 0,
-            'admin_logged_in': False,
-            'current_page': '📊 データ分析',
-            'show_sidebar': True,
-            
-            # OmniSorter 固有の状態
-            'daily_orders': 100,
-            'pieces_per_order': 2.5,
-            'daily_volume': 250,
-            'product_length': 300,
-            'product_width': 250,
-            'product_height': 150,
-            'product_weight': 1000,
-            'required_ports': 80,
-            'data_source': '手動入力',
-            'has_detailed_analysis': False,
-            'peak_ratio': 1.0,
-            'working_hours': 8.0,
-            
-            # 計算結果の保存
-            'calculation_results': None,
-            'last_analysis_result': None,
-            'analysis_data_available': False,
-            
-            # 設定関連
-            'container_model_matrix': None,
-            'omnisorter_specs': None,
-            
-            # 管理者関連
-            'admin_user': '',
-            'admin_page': ''
-        }
+        session_state = st.session_state
+        # 初期化済みのセッションでは再実行のたびに既定値を走査しない。
+        # モジュールはセッション間で共有されるため、フラグはセッションごとに持つ
+        if session_state.get(_SESSION_INITIALIZED_KEY):
+            return
+
+        for key, default_value in _SESSION_DEFAULTS.items():
+            if isinstance(default_value, (list, dict)):
+                default_value = copy.copy(default_value)
+            session_state.setdefault(key, default_value)
+        session_state[_SESSION_INITIALIZED_KEY] = True
         
-        for key, default_value in defaults.items():
-            if key not in st.session_state:
-                st.session_state[key] = default_value
-        
-        # 設定の初期化（初回のみ）- YAMLから読み込み、失敗時はデフォルト値
-        if st.session_state.get('container_model_matrix') is None:
-            st.session_state['container_model_matrix'] = get_container_matrix()
+        # 設定（container_model_matrix / omnisorter_specs）はここでは読み込まない。
+        # None のままにしておき、参照側（get_container_model_config など）が
+        # 必要になった時点で get_container_matrix() / get_omnisorter_specs() から取得する
 
-        if st.session_state.get('omnisorter_specs') is None:
-            st.session_state['omnisorter_specs'] = get_omnisorter_specs()
-            
     except Exception as e:
-        print(f"Session state initialization error: {str(e)}")
+        _log.exception("Session state initialization failed")
+        _error_ring.append((time.time(), "".join(traceback.format_exception(e))))
+
+
+def get_recent_errors() -> List[Tuple[float, str]]:
+    """直近に記録したエラーを (発生時刻のUNIX時間, トレースバック文字列) として古い順に返す（最大256件）"""
+    return list(_error_ring)
 
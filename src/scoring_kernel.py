@@ -0,0 +1,219 @@
+"""
+OmniSorter 機種スコアリングカーネル
+
+機種ごとの必要台数・間口構成・稼働率・スコアを配列で一括計算する。
+numba が利用可能で機種数が多い場合は JIT コンパイル版を使用する。
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+# JIT版に切り替える機種数の下限（少数の機種では NumPy 版の方が速い）
+JIT_MIN_MODELS = 32
+
+
+def _score_models_numpy(
+    processing_capacity, total_ports, ports_per_block, min_blocks, max_blocks,
+    mini_blocks, is_mini, base_score,
+    required_pcs_per_hour, required_orders_per_hour, target_utilization, target_rotation,
+    scoring
+):
+    """スコアリングの NumPy 実装"""
+    (optimal_min, optimal_max, high_max, optimal_bonus, high_bonus, overload_penalty,
+     units_penalty, ports_penalty, ports_baseline) = scoring
+
+    # 必要台数（処理能力ベース / 間口数ベースの大きい方）
+    effective_capacity_per_unit = processing_capacity * target_utilization
+    units_by_capacity = np.ceil(required_pcs_per_hour / effective_capacity_per_unit)
+    min_ports_needed = np.ceil(required_orders_per_hour / target_rotation)
+    units_by_ports = np.ceil(min_ports_needed / total_ports)
+    recommended_units = np.maximum(units_by_capacity, units_by_ports).astype(np.int64)
+
+    # 1台あたりの間口数を上限内に収める
+    ports_per_unit = np.where(
+        recommended_units > 0,
+        np.ceil(min_ports_needed / np.maximum(recommended_units, 1)),
+        min_ports_needed
+    ).astype(np.int64)
+    ports_per_unit = np.minimum(ports_per_unit, total_ports)
+
+    # ブロック数・間口数（mini は固定構成）
+    blocks_needed = np.ceil(ports_per_unit / np.maximum(ports_per_block, 1)).astype(np.int64)
+    blocks_needed = np.maximum(min_blocks, np.minimum(blocks_needed, max_blocks))
+    num_blocks = np.where(is_mini, mini_blocks, blocks_needed)
+    num_intervals = np.where(is_mini, total_ports, num_blocks * ports_per_block)
+
+    # 稼働率・実際の回転数（候補外の機種は呼び出し側で除外するため0除算を抑止）
+    with np.errstate(divide='ignore', invalid='ignore'):
+        capacity_utilization = (required_pcs_per_hour / (processing_capacity * recommended_units)) * 100
+        actual_rotation = required_orders_per_hour / (num_intervals * recommended_units)
+
+    # 稼働率適合度・コストペナルティ
+    score = base_score + np.select(
+        [
+            (optimal_min <= capacity_utilization) & (capacity_utilization <= optimal_max),
+            (optimal_max < capacity_utilization) & (capacity_utilization <= high_max),
+            capacity_utilization > 100,
+        ],
+        [optimal_bonus, high_bonus, overload_penalty],
+        0
+    )
+    score = score - (recommended_units - 1) * units_penalty
+    score = score - (num_intervals - ports_baseline) * ports_penalty
+
+    return (units_by_capacity, units_by_ports, recommended_units, num_blocks,
+            num_intervals, capacity_utilization, actual_rotation, score)
+
+
+def _score_models_loop(
+    processing_capacity, total_ports, ports_per_block, min_blocks, max_blocks,
+    mini_blocks, is_mini, base_score,
+    required_pcs_per_hour, required_orders_per_hour, target_utilization, target_rotation,
+    scoring
+):
+    """スコアリングのループ実装（numba で JIT コンパイルして使用）"""
+    (optimal_min, optimal_max, high_max, optimal_bonus, high_bonus, overload_penalty,
+     units_penalty, ports_penalty, ports_baseline) = scoring
+
+    n = processing_capacity.shape[0]
+    units_by_capacity = np.empty(n, dtype=np.float64)
+    units_by_ports = np.empty(n, dtype=np.float64)
+    recommended_units = np.empty(n, dtype=np.int64)
+    num_blocks = np.empty(n, dtype=np.int64)
+    num_intervals = np.empty(n, dtype=np.int64)
+    capacity_utilization = np.empty(n, dtype=np.float64)
+    actual_rotation = np.empty(n, dtype=np.float64)
+    score = np.empty(n, dtype=np.float64)
+
+    min_ports_needed = np.ceil(required_orders_per_hour / target_rotation)
+
+    for i in range(n):
+        capacity = processing_capacity[i]
+        ports_limit = total_ports[i]
+
+        units_by_capacity[i] = np.ceil(required_pcs_per_hour / (capacity * target_utilization))
+        units_by_ports[i] = np.ceil(min_ports_needed / ports_limit)
+        units = int(max(units_by_capacity[i], units_by_ports[i]))
+        recommended_units[i] = units
+
+        if units > 0:
+            ports_per_unit = int(np.ceil(min_ports_needed / units))
+        else:
+            ports_per_unit = int(min_ports_needed)
+        ports_per_unit = min(ports_per_unit, ports_limit)
+
+        if is_mini[i]:
+            blocks = mini_blocks[i]
+            intervals = ports_limit
+        else:
+            blocks = int(np.ceil(ports_per_unit / max(ports_per_block[i], 1)))
+            blocks = max(min_blocks[i], min(blocks, max_blocks[i]))
+            intervals = blocks * ports_per_block[i]
+        num_blocks[i] = blocks
+        num_intervals[i] = intervals
+
+        if units > 0:
+            utilization = (required_pcs_per_hour / (capacity * units)) * 100
+        else:
+            utilization = np.inf
+        if units > 0 and intervals > 0:
+            rotation = required_orders_per_hour / (intervals * units)
+        else:
+            rotation = np.inf
+        capacity_utilization[i] = utilization
+        actual_rotation[i] = rotation
+
+        s = base_score[i]
+        if optimal_min <= utilization <= optimal_max:
+            s += optimal_bonus
+        elif optimal_max < utilization <= high_max:
+            s += high_bonus
+        elif utilization > 100:
+            s += overload_penalty
+        s -= (units - 1) * units_penalty
+        s -= (intervals - ports_baseline) * ports_penalty
+        score[i] = s
+
+    return (units_by_capacity, units_by_ports, recommended_units, num_blocks,
+            num_intervals, capacity_utilization, actual_rotation, score)
+
+
+@lru_cache(maxsize=1)
+def _get_score_models_jit():
+    """
+    JIT版のスコアリング関数を初回利用時に用意する
+
+    numba の import（数百ms）は JIT版を使う規模の計算で初めて行い、起動時間に含めない。
+    コンパイルは初回呼び出し時（型指定による事前コンパイルはしない）。
+    error_model='numpy' で0除算を NumPy 版と同じく inf/nan として扱う。
+
+    Returns:
+        JIT版の関数。numba がない場合は None
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True, error_model='numpy')(_score_models_loop)
+
+
+def score_models(
+    processing_capacity: np.ndarray,
+    total_ports: np.ndarray,
+    ports_per_block: np.ndarray,
+    min_blocks: np.ndarray,
+    max_blocks: np.ndarray,
+    mini_blocks: np.ndarray,
+    is_mini: np.ndarray,
+    base_score: np.ndarray,
+    required_pcs_per_hour: float,
+    required_orders_per_hour: float,
+    target_utilization: float,
+    target_rotation: float,
+    scoring: Tuple[float, ...]
+) -> Tuple[np.ndarray, ...]:
+    """
+    機種ごとの構成とスコアを一括計算する
+
+    Args:
+        processing_capacity: 処理能力 (pcs/時)
+        total_ports: 1台あたりの間口数上限
+        ports_per_block: ブロックあたり間口数（容器タイプ考慮済み）
+        min_blocks: ブロック数下限
+        max_blocks: ブロック数上限
+        mini_blocks: mini機種の固定ブロック数
+        is_mini: mini機種フラグ
+        base_score: 機種優先度 + 容器推奨ボーナス
+        required_pcs_per_hour: 必要処理能力 (pcs/時)
+        required_orders_per_hour: 必要件数 (件/時)
+        target_utilization: 目標稼働率
+        target_rotation: 目標回転数
+        scoring: (optimal_min, optimal_max, high_max, optimal_bonus, high_bonus,
+                  overload_penalty, units_penalty, ports_penalty, ports_baseline)
+
+    Returns:
+        (処理能力ベース台数, 間口数ベース台数, 推奨台数, ブロック数, 間口数,
+         稼働率, 実回転数, スコア) のタプル
+    """
+    args = (
+        np.ascontiguousarray(processing_capacity, dtype=np.float64),
+        np.ascontiguousarray(total_ports, dtype=np.int64),
+        np.ascontiguousarray(ports_per_block, dtype=np.int64),
+        np.ascontiguousarray(min_blocks, dtype=np.int64),
+        np.ascontiguousarray(max_blocks, dtype=np.int64),
+        np.ascontiguousarray(mini_blocks, dtype=np.int64),
+        np.ascontiguousarray(is_mini, dtype=np.bool_),
+        np.ascontiguousarray(base_score, dtype=np.float64),
+        float(required_pcs_per_hour),
+        float(required_orders_per_hour),
+        float(target_utilization),
+        float(target_rotation),
+        tuple(float(v) for v in scoring),
+    )
+    if args[0].shape[0] >= JIT_MIN_MODELS:
+        score_models_jit = _get_score_models_jit()
+        if score_models_jit is not None:
+            return score_models_jit(*args)
+    return _score_models_numpy(*args)